@@ -0,0 +1,75 @@
+"""
+Per-user content permissions.
+
+ClientAccess.scope lists the product, service and lab ids a client may see
+beyond public content. AccessScope turns that document into frozensets once
+per session - it is cached next to the user in SessionCache - so endpoints
+enforce visibility with set membership instead of querying client_access
+per request or per item.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Optional
+
+from models import ClientAccess, Role, User, Visibility
+
+# Roles that see every item regardless of ClientAccess
+FULL_ACCESS_ROLES = {Role.ADMIN}
+
+# Collections whose non-public items are gated by ClientAccess.scope
+SCOPED_COLLECTIONS = ("products", "services", "labs")
+
+
+class AccessScope:
+    """What one caller may see. Immutable; shared by every request of a session."""
+
+    def __init__(self, access: Optional[ClientAccess] = None, full_access: bool = False):
+        self.access = access
+        self.full_access = full_access
+
+        scope = access.scope if access is not None and not _expired(access) else None
+        self.ids: Dict[str, FrozenSet[str]] = {
+            c: frozenset(getattr(scope, c)) if scope is not None else frozenset()
+            for c in SCOPED_COLLECTIONS
+        }
+
+        # Identifies the visible set in ETags and cached views
+        if full_access:
+            self.key = "all"
+        else:
+            h = hashlib.sha256()
+            for collection in SCOPED_COLLECTIONS:
+                h.update(collection.encode())
+                for item_id in sorted(self.ids[collection]):
+                    h.update(b"\x1f" + item_id.encode())
+            self.key = h.hexdigest()[:16]
+
+    @classmethod
+    def for_user(cls, user: User, access_doc: Optional[dict]) -> "AccessScope":
+        access = ClientAccess(**access_doc) if access_doc else None
+        return cls(access, full_access=user.role in FULL_ACCESS_ROLES)
+
+    def allows(self, collection: str, item: Any) -> bool:
+        """Whether the caller may see an item of a content collection."""
+        if item.visibility == Visibility.PUBLIC or self.full_access:
+            return True
+        # Non-public pages carry no scope, so only full-access roles see them
+        return item.id in self.ids.get(collection, ())
+
+    def visible_ids(self, collection: str) -> Optional[FrozenSet[str]]:
+        """Ids the caller may see beyond public items, or None for everything."""
+        return None if self.full_access else self.ids[collection]
+
+
+def _expired(access: ClientAccess) -> bool:
+    if access.expires_at is None:
+        return False
+    expires_at = access.expires_at
+    if expires_at.tzinfo is None:
+        # BSON dates come back naive (UTC)
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= datetime.now(timezone.utc)
+
+
+# Callers without a session
+ANONYMOUS = AccessScope()
@@ -0,0 +1,451 @@
+"""
+Load test for every endpoint in server.py.
+
+Seeds a synthetic catalog (document shapes from seed_content.py, via
+bench_serialization.make_catalog) plus users, client_access grants and
+100k sessions, starts the app in-process and drives each endpoint with
+concurrent async clients through httpx's ASGI transport. Reports
+throughput, p50/p95/p99 latency and peak bytes allocated per request
+(tracemalloc, measured in a separate sequential pass so tracing does not
+distort the timings), and compares them with a stored baseline.
+
+Runs against the MongoDB named by MONGO_URL (a local mongod), or against
+mongomock-motor with --mongomock. mongomock scans collections for every
+query, so session lookups there cost milliseconds per thousand sessions;
+use it with a small --sessions as a smoke run, and keep baselines from a
+mongod run. Collections are always written to
+BENCH_DB_NAME (default relvanta_bench), never DB_NAME. Firebase is not
+contacted: POST /api/auth/session gets a stand-in token verifier, so that
+scenario measures the API side of login only.
+
+Usage:
+    python bench_load.py [--mongomock] [--products 2000] [--sessions 100000]
+                         [--requests 1000] [--concurrency 32]
+                         [--baseline bench_load_baseline.json] [--save-baseline]
+                         [--threshold 0.25]
+
+Exits with status 1 when a scenario regresses past the threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+if os.getenv("PYTHON_ENV") == "production":
+    raise RuntimeError("❌ Refusing to run the load test in production environment")
+
+# server.py reads these at import time; the bench never touches DB_NAME
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "relvanta_bench")
+os.environ.setdefault("MDX_RENDER_WORKERS", "0")
+os.environ.setdefault("METRICS_TOKEN", "bench-metrics")
+
+import httpx
+
+import server
+from bench_serialization import make_catalog
+from content_store import bump_content_version
+from models import status_rank
+
+DEFAULT_BASELINE = Path(__file__).parent / "bench_load_baseline.json"
+
+SEEDED_COLLECTIONS = (
+    "products", "services", "labs", "pages", "redirects",
+    "users", "user_sessions", "client_access", "content_meta",
+)
+
+SEARCH_QUERIES = ["visual", "anal", "lorem ipsum", "product 12", "delivery", "overview"]
+
+INSERT_BATCH = 10000
+
+
+class Fixture:
+    """What was seeded, for building requests."""
+
+    def __init__(self):
+        self.product_slugs: List[str] = []
+        self.protected_ids: List[str] = []
+        self.service_slugs: List[str] = []
+        self.lab_ids: List[str] = []
+        self.lab_slugs: List[str] = []
+        self.page_slugs: List[str] = []
+        self.redirect_paths: List[str] = []
+        self.user_ids: List[str] = []
+        # (session token, user_id) per role
+        self.client_sessions: List[Tuple[str, str]] = []
+        self.admin_sessions: List[Tuple[str, str]] = []
+        # Tokens minted by the login scenario, spent by the logout scenario
+        self.login_tokens: List[str] = []
+
+
+async def insert_batched(collection, docs: List[dict]) -> None:
+    for start in range(0, len(docs), INSERT_BATCH):
+        await collection.insert_many(docs[start:start + INSERT_BATCH], ordered=False)
+
+
+async def seed(db, args, rng: random.Random) -> Fixture:
+    fixture = Fixture()
+    for name in SEEDED_COLLECTIONS:
+        await db[name].delete_many({})
+
+    catalog = make_catalog(args.products)
+    for i, product in enumerate(catalog["products"]):
+        product["status_rank"] = status_rank(product["status"])
+        # Every tenth product is gated by ClientAccess
+        if i % 10 == 9:
+            product["visibility"] = "protected"
+            fixture.protected_ids.append(product["id"])
+        fixture.product_slugs.append(product["slug"])
+    fixture.service_slugs = [s["slug"] for s in catalog["services"]]
+    fixture.lab_ids = [lab["id"] for lab in catalog["labs"]]
+    fixture.lab_slugs = [lab["slug"] for lab in catalog["labs"]]
+    fixture.page_slugs = [p["slug"] for p in catalog["pages"]]
+    fixture.redirect_paths = [r["from"] for r in catalog["redirects"] if not r["from"].endswith("*")]
+    fixture.redirect_paths.append("/old/a/b")
+
+    for collection, docs in catalog.items():
+        await insert_batched(db[collection], docs)
+
+    now = datetime.now(timezone.utc)
+    users, grants = [], []
+    for i in range(args.users):
+        user_id = f"user_{i:08d}"
+        role = "admin" if i % 100 == 0 else "client"
+        users.append({
+            "user_id": user_id,
+            "email": f"user{i}@example.com",
+            "name": f"User {i}",
+            "role": role,
+            "organization_slug": None,
+            "created_at": now,
+        })
+        fixture.user_ids.append(user_id)
+        if role == "client" and i % 3 == 0:
+            grants.append({
+                "user_id": user_id,
+                "scope": {
+                    "products": rng.sample(fixture.protected_ids, min(5, len(fixture.protected_ids))),
+                    "services": [],
+                    "labs": rng.sample(fixture.lab_ids, min(3, len(fixture.lab_ids))),
+                },
+                "permissions": ["read"],
+                "granted_at": now,
+            })
+    await insert_batched(db.users, users)
+    await insert_batched(db.client_access, grants)
+
+    sessions = []
+    for i in range(args.sessions):
+        user = users[i % len(users)]
+        token = f"sess_bench_{i:08d}"
+        sessions.append({
+            "user_id": user["user_id"],
+            "session_token": token,
+            "expires_at": now + timedelta(days=7),
+            "created_at": now,
+        })
+        target = fixture.admin_sessions if user["role"] == "admin" else fixture.client_sessions
+        target.append((token, user["user_id"]))
+    await insert_batched(db.user_sessions, sessions)
+
+    await bump_content_version(db, now)
+    return fixture
+
+
+# ----------------------------------------------------------------------------
+# Scenarios: (name, build request, expected statuses)
+# ----------------------------------------------------------------------------
+
+Request = Tuple[str, str, Dict[str, str]]
+Scenario = Tuple[str, Callable[[random.Random], Request], Tuple[int, ...]]
+
+
+def bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def scenarios(fixture: Fixture, list_etag: str) -> List[Scenario]:
+    f = fixture
+
+    def client(rng):
+        return rng.choice(f.client_sessions)
+
+    def admin(rng):
+        return rng.choice(f.admin_sessions)
+
+    def batch(rng, slugs):
+        return ",".join(rng.sample(slugs, min(20, len(slugs))))
+
+    def login(rng):
+        return ("POST", "/api/auth/session", bearer(f"bench-firebase:{rng.randrange(len(f.user_ids))}"))
+
+    def logout(rng):
+        token = f.login_tokens.pop() if f.login_tokens else client(rng)[0]
+        return ("POST", "/api/auth/logout", bearer(token))
+
+    return [
+        ("health", lambda rng: ("GET", "/health", {}), (200,)),
+        ("metrics", lambda rng: ("GET", "/metrics", bearer(os.environ["METRICS_TOKEN"])), (200,)),
+        ("root", lambda rng: ("GET", "/api/", {}), (200,)),
+        ("products", lambda rng: ("GET", "/api/content/products", {}), (200,)),
+        ("products (304)", lambda rng: ("GET", "/api/content/products", {"If-None-Match": list_etag}), (304,)),
+        ("products fields=full", lambda rng: ("GET", "/api/content/products?fields=full", {}), (200,)),
+        ("products protected", lambda rng: (
+            "GET", "/api/content/products?visibility=protected", bearer(client(rng)[0])), (200,)),
+        ("products:batch", lambda rng: (
+            "GET", f"/api/content/products:batch?slugs={batch(rng, f.product_slugs)}", {}), (200,)),
+        ("product", lambda rng: (
+            "GET", f"/api/content/products/{rng.choice(f.product_slugs)}", bearer(admin(rng)[0])), (200,)),
+        ("product expand+render", lambda rng: (
+            "GET", f"/api/content/products/{rng.choice(f.product_slugs)}?expand=related&render=html",
+            bearer(admin(rng)[0])), (200,)),
+        ("services", lambda rng: ("GET", "/api/content/services", {}), (200,)),
+        ("services:batch", lambda rng: (
+            "GET", f"/api/content/services:batch?slugs={batch(rng, f.service_slugs)}", {}), (200,)),
+        ("service", lambda rng: ("GET", f"/api/content/services/{rng.choice(f.service_slugs)}", {}), (200,)),
+        ("labs", lambda rng: ("GET", "/api/content/labs", bearer(client(rng)[0])), (200,)),
+        ("lab", lambda rng: (
+            "GET", f"/api/content/labs/{rng.choice(f.lab_slugs)}", bearer(admin(rng)[0])), (200,)),
+        ("page", lambda rng: ("GET", f"/api/content/pages/{rng.choice(f.page_slugs)}", {}), (200,)),
+        ("search", lambda rng: ("GET", f"/api/content/search?q={rng.choice(SEARCH_QUERIES)}", {}), (200,)),
+        ("redirects", lambda rng: ("GET", "/api/content/redirects", {}), (200,)),
+        ("redirects/compiled", lambda rng: ("GET", "/api/content/redirects/compiled", {}), (200,)),
+        ("redirects/resolve", lambda rng: (
+            "GET", f"/api/content/redirects/resolve?path={rng.choice(f.redirect_paths)}", {}), (200,)),
+        ("auth/me", lambda rng: ("GET", "/api/auth/me", bearer(client(rng)[0])), (200,)),
+        ("access (own)", lambda rng: (
+            lambda session: ("GET", f"/api/access/{session[1]}", bearer(session[0])))(client(rng)), (200,)),
+        ("access (admin)", lambda rng: (
+            "GET", f"/api/access/{rng.choice(f.user_ids)}", bearer(admin(rng)[0])), (200,)),
+        ("auth/session", login, (200,)),
+        ("auth/logout", logout, (200,)),
+    ]
+
+
+def install_firebase_stand_in(fixture: Fixture) -> None:
+    """Accept "bench-firebase:<n>" as the ID token of seeded user n."""
+
+    async def verify(id_token: str) -> Optional[dict]:
+        _, _, n = id_token.partition("bench-firebase:")
+        if not n.isdigit():
+            return None
+        return {"uid": f"firebase-{n}", "email": f"user{n}@example.com", "name": f"User {n}"}
+
+    server.verify_firebase_token = verify
+
+
+# ----------------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------------
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def send(client: httpx.AsyncClient, request: Request, fixture: Fixture) -> int:
+    method, url, headers = request
+    response = await client.request(method, url, headers=headers)
+    if url == "/api/auth/session" and response.status_code == 200:
+        fixture.login_tokens.append(response.cookies["session_token"])
+    return response.status_code
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    fixture: Fixture,
+    requests: int,
+    concurrency: int,
+    rng: random.Random,
+) -> Dict[str, float]:
+    _, build, expected = scenario
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            request = build(rng)
+            start = time.perf_counter()
+            status = await send(client, request, fixture)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += status not in expected
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "throughput": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "errors": errors,
+    }
+
+
+async def measure_allocations(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    fixture: Fixture,
+    samples: int,
+    rng: random.Random,
+) -> float:
+    """Median peak KiB traced while serving one request, sequentially."""
+    _, build, _ = scenario
+    peaks = []
+    for _ in range(samples):
+        request = build(rng)
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await send(client, request, fixture)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    return round(statistics.median(peaks) / 1024, 1)
+
+
+# ----------------------------------------------------------------------------
+# Baseline comparison
+# ----------------------------------------------------------------------------
+
+# Metric -> whether a higher value is better
+COMPARED = {"throughput": True, "p95_ms": False, "p99_ms": False, "alloc_kib": False}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Regressions beyond threshold (a fraction of the baseline value)."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+# ----------------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mongomock", action="store_true", help="use mongomock-motor instead of MONGO_URL")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--alloc-samples", type=int, default=50)
+    parser.add_argument("--only", help="comma-separated scenario names to run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    return parser.parse_args()
+
+
+def use_mongomock() -> None:
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("--mongomock needs mongomock-motor (pip install mongomock-motor)")
+
+    server.client = AsyncMongoMockClient()
+    server.db = server.client[os.environ["DB_NAME"]]
+    server.content_store.db = server.db
+    server.content_watcher.db = server.db
+
+
+async def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    if args.mongomock:
+        use_mongomock()
+
+    started = time.perf_counter()
+    fixture = await seed(server.db, args, rng)
+    print(
+        f"seeded {args.products} products, {args.users} users, {args.sessions} sessions "
+        f"in {time.perf_counter() - started:.1f}s ({'mongomock' if args.mongomock else os.environ['MONGO_URL']})"
+    )
+
+    install_firebase_stand_in(fixture)
+    await server.startup()
+    results: Dict[str, dict] = {}
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            list_etag = (await client.get("/api/content/products")).headers["ETag"]
+            selected = scenarios(fixture, list_etag)
+            if args.only:
+                names = set(args.only.split(","))
+                selected = [s for s in selected if s[0] in names]
+
+            for scenario in selected:
+                results[scenario[0]] = await run_scenario(
+                    client, scenario, fixture, args.requests, args.concurrency, rng,
+                )
+                print(f"  {scenario[0]}: {results[scenario[0]]['throughput']} req/s", flush=True)
+
+            tracemalloc.start()
+            for scenario in selected:
+                results[scenario[0]]["alloc_kib"] = await measure_allocations(
+                    client, scenario, fixture, args.alloc_samples, rng,
+                )
+            tracemalloc.stop()
+    finally:
+        await server.shutdown_db_client()
+
+    print(f"requests per scenario: {args.requests}, concurrency: {args.concurrency}")
+    print(f"{'scenario':24} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'alloc KiB':>10} {'errors':>7}")
+    for name, r in results.items():
+        print(
+            f"{name:24} {r['throughput']:9.1f} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} "
+            f"{r['p99_ms']:8.2f} {r['alloc_kib']:10.1f} {r['errors']:7d}"
+        )
+    print("session cache:", server.session_cache.stats())
+    print("response cache:", server.response_cache.stats())
+
+    params = {
+        "backend": "mongomock" if args.mongomock else "mongod",
+        "products": args.products,
+        "users": args.users,
+        "sessions": args.sessions,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    failed = any(r["errors"] for r in results.values())
+    if failed:
+        print("\nunexpected status codes in:", ", ".join(n for n, r in results.items() if r["errors"]))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({"params": params, "results": results}, indent=2) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+    elif args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+        if stored.get("params") != params:
+            print(f"\nnote: baseline was recorded with {stored.get('params')}")
+        regressions = compare(results, stored.get("results", {}), args.threshold)
+        print(f"\nregressions beyond {args.threshold:.0%} of {args.baseline.name}: {len(regressions)}")
+        for line in regressions:
+            print("  " + line)
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
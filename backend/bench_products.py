@@ -0,0 +1,123 @@
+"""
+Microbenchmark for GET /api/content/products.
+
+Compares the original request path (build Product models per request,
+re-validate against response_model, jsonable_encoder + json.dumps) with the
+cached path (models validated once, serialized bytes cached per ETag).
+Runs entirely in-process through httpx's ASGI transport; no MongoDB needed.
+
+Usage:
+    python bench_products.py [--products 200] [--requests 2000]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from fastapi import FastAPI, Request
+
+from http_cache import PUBLIC_CACHE_CONTROL, make_etag
+from models import Product, ProductListResponse
+from response_cache import ResponseCache, cached_json_response
+
+STATUSES = ["live", "beta", "pilot", "idea", "deprecated", "archived"]
+STATUS_ORDER = {s: i for i, s in enumerate(STATUSES)}
+
+
+def make_products(count: int) -> list:
+    """Synthetic documents shaped like the ones in seed_content.py."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "slug": f"product-{i}",
+            "created_at": now,
+            "updated_at": now,
+            "visibility": "public",
+            "order": i % 10,
+            "name": f"Product {i}",
+            "tagline": "AI-powered visual intelligence for modern businesses",
+            "short_description": "Transform visual data into actionable insights.",
+            "long_description": "## Overview\n\n" + "Lorem ipsum dolor sit amet. " * 80,
+            "category": "Visual Analytics",
+            "status": STATUSES[i % len(STATUSES)],
+            "accent_color": "#4A90E2",
+            "icon": f"/icons/product-{i}.svg",
+            "features": ["Real-time detection", "Anomaly detection", "Quality control"],
+            "target_audience": "Retail, Manufacturing",
+            "links": {"demo": f"/products/product-{i}/demo"},
+            "theme": {"primary_color": "#4A90E2", "secondary_color": "#E0F2F7"},
+        }
+        for i in range(count)
+    ]
+
+
+def sort_key(p):
+    return (p.order if p.order is not None else 999, STATUS_ORDER.get(p.status.value, 999), p.name)
+
+
+def build_before_app(docs: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/content/products", response_model=ProductListResponse)
+    async def list_products(limit: int = 100):
+        products = sorted((Product(**d) for d in docs[:limit]), key=sort_key)
+        return ProductListResponse(products=products, total=len(products))
+
+    return app
+
+
+def build_after_app(docs: list) -> FastAPI:
+    app = FastAPI()
+    models = [Product(**d) for d in docs]
+    cache = ResponseCache()
+
+    @app.get("/api/content/products", response_model=ProductListResponse)
+    async def list_products(request: Request, limit: int = 100):
+        etag = make_etag("products", None, None, None, limit, "bench")
+
+        def build():
+            products = sorted(models[:limit], key=sort_key)
+            return ProductListResponse(products=products, total=len(products))
+
+        body = cache.get_or_build(etag, build)
+        return cached_json_response(body, etag, PUBLIC_CACHE_CONTROL)
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int, limit: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        url = f"/api/content/products?limit={limit}"
+        for _ in range(20):
+            (await client.get(url)).raise_for_status()
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(url)
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    docs = make_products(args.products)
+    before = await measure(build_before_app(docs), args.requests, args.products)
+    after = await measure(build_after_app(docs), args.requests, args.products)
+
+    print(f"products per response : {args.products}")
+    print(f"before (per-request)  : {before:10.1f} req/s")
+    print(f"after  (cached bytes) : {after:10.1f} req/s")
+    print(f"speedup               : {after / before:10.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,215 @@
+"""
+Serialization benchmark for the /api/content/* routes.
+
+Runs the real app in-process through httpx's ASGI transport against a
+synthetic catalog loaded straight into the ContentStore, with the response
+cache disabled so every request serializes its body. Each route is measured
+twice: "before" serializes like FastAPI's stock JSONResponse
+(jsonable_encoder + json.dumps), "after" uses response_cache.json_bytes
+(pydantic-core model_dump_json, orjson for plain payloads). Reports p50/p99
+request latency and serialization CPU time per request. No MongoDB needed.
+
+Usage:
+    python bench_serialization.py [--products 200] [--requests 300]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+# server.py needs these at import time; nothing connects to MongoDB here
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("MDX_RENDER_WORKERS", "0")
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+import response_cache
+import server
+from access import AccessScope
+from bench_products import make_products
+from models import User
+
+SESSION_TOKEN = "sess_bench"
+
+ROUTES = [
+    ("products (summary)", "/api/content/products"),
+    ("products (fields=full)", "/api/content/products?fields=full"),
+    ("products (sparse)", "/api/content/products?fields=name,status,accent_color"),
+    ("products:batch", "/api/content/products:batch?slugs=" + ",".join(f"product-{i}" for i in range(20))),
+    ("product", "/api/content/products/product-1"),
+    ("product expand+render", "/api/content/products/product-1?expand=related&render=html"),
+    ("services", "/api/content/services"),
+    ("service", "/api/content/services/service-1"),
+    ("labs", "/api/content/labs"),
+    ("lab", "/api/content/labs/lab-1"),
+    ("page", "/api/content/pages/page-1"),
+    ("search", "/api/content/search?q=visual+anal"),
+    ("redirects", "/api/content/redirects"),
+    ("redirects/compiled", "/api/content/redirects/compiled"),
+    ("redirects/resolve", "/api/content/redirects/resolve?path=/old/a/b"),
+]
+
+
+def make_catalog(count: int) -> Dict[str, List[dict]]:
+    """Synthetic documents for every content collection."""
+    now = datetime.now(timezone.utc)
+    products = make_products(count)
+    for i, product in enumerate(products):
+        product["related_products"] = [products[(i + k) % count]["id"] for k in (1, 2, 3)]
+
+    def base(kind: str, i: int) -> dict:
+        return {
+            "id": f"{kind}-id-{i}",
+            "slug": f"{kind}-{i}",
+            "created_at": now,
+            "updated_at": now,
+            "order": i % 10,
+        }
+
+    body = "## Overview\n\n" + "Lorem ipsum dolor sit amet. " * 80
+    return {
+        "products": products,
+        "services": [
+            {**base("service", i), "visibility": "public", "name": f"Service {i}",
+             "summary": "Hands-on delivery.", "description": body,
+             "scope": ["Discovery", "Build"], "engagement_type": "project"}
+            for i in range(count // 4 or 1)
+        ],
+        "labs": [
+            {**base("lab", i), "visibility": "labs", "name": f"Lab {i}",
+             "description": body, "status": "running",
+             "metrics": [{"name": "accuracy", "target": "95%"}]}
+            for i in range(count // 4 or 1)
+        ],
+        "pages": [
+            {**base("page", i), "visibility": "public", "title": f"Page {i}", "content": body}
+            for i in range(10)
+        ],
+        "redirects": [
+            {"from": f"/legacy/{i}", "to": f"/products/product-{i}", "permanent": True}
+            for i in range(count)
+        ] + [{"from": "/old/*", "to": "/new/*", "permanent": True}],
+    }
+
+
+def load_catalog(catalog: Dict[str, List[dict]]) -> None:
+    store = server.content_store
+    for collection, docs in catalog.items():
+        for i, doc in enumerate(docs):
+            store.upsert(collection, {"_id": i, **doc})
+    store.loaded_at = time.monotonic()
+
+    admin = User(
+        user_id="user_bench",
+        email="bench@example.com",
+        name="Bench",
+        role="admin",
+        created_at=datetime.now(timezone.utc),
+    )
+    server.session_cache.max_size = 1
+    server.session_cache.ttl_seconds = 24 * 3600
+    server.session_cache.set(
+        SESSION_TOKEN,
+        admin,
+        AccessScope(full_access=True),
+        datetime.now(timezone.utc) + timedelta(days=1),
+    )
+
+
+def stock_json_bytes(payload: Any) -> bytes:
+    """FastAPI's stock path: jsonable_encoder, then JSONResponse.render."""
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class Timed:
+    """Wraps a serializer and accumulates the CPU time spent in it."""
+
+    def __init__(self, serialize: Callable[[Any], bytes]):
+        self.serialize = serialize
+        self.cpu = 0.0
+
+    def __call__(self, payload: Any) -> bytes:
+        start = time.thread_time()
+        body = self.serialize(payload)
+        self.cpu += time.thread_time() - start
+        return body
+
+
+def use_serializer(serialize: Callable[[Any], bytes]) -> None:
+    response_cache.json_bytes = serialize
+    server.json_bytes = serialize
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure(serialize: Callable[[Any], bytes], requests: int) -> Dict[str, Tuple[float, float, float]]:
+    """{route: (p50 ms, p99 ms, serialization CPU µs per request)}"""
+    results = {}
+    transport = httpx.ASGITransport(app=server.app)
+    headers = {"Authorization": f"Bearer {SESSION_TOKEN}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name, url in ROUTES:
+            timed = Timed(serialize)
+            use_serializer(timed)
+            for _ in range(10):
+                (await client.get(url)).raise_for_status()
+
+            timed.cpu = 0.0
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                await client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            results[name] = (
+                percentile(latencies, 0.50),
+                percentile(latencies, 0.99),
+                timed.cpu / requests * 1e6,
+            )
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    load_catalog(make_catalog(args.products))
+    # Serialize on every request instead of replaying cached bytes
+    server.response_cache.max_entries = 0
+
+    after_serializer = response_cache.json_bytes
+    before = await measure(stock_json_bytes, args.requests)
+    after = await measure(after_serializer, args.requests)
+    use_serializer(after_serializer)
+
+    print(f"products: {args.products}, requests per route: {args.requests}")
+    print(f"{'route':26} {'p50 ms':>15} {'p99 ms':>15} {'serialize µs':>19}")
+    print(f"{'':26} {'before':>7} {'after':>7} {'before':>7} {'after':>7} {'before':>9} {'after':>9}")
+    for name, _ in ROUTES:
+        b, a = before[name], after[name]
+        print(
+            f"{name:26} {b[0]:7.2f} {a[0]:7.2f} {b[1]:7.2f} {a[1]:7.2f} "
+            f"{b[2]:9.1f} {a[2]:9.1f}"
+        )
+
+    server.render_cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,197 @@
+"""
+gzip / brotli response compression.
+
+CompressionMiddleware negotiates Accept-Encoding for JSON and text
+responses above a minimum size. When the body is one the ResponseCache
+holds (same ETag, same bytes), the compressed form is produced once per
+content version and stored next to the uncompressed body, so repeat
+requests only pay for a dict lookup. Other bodies are compressed per
+request at a cheaper level. Brotli is used when the `brotli` package is
+installed; gzip is always available.
+"""
+import gzip
+from functools import lru_cache
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Preferred first when the client rates them equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Cached bodies are compressed once, so they get the expensive levels
+PRECOMPRESS_LEVELS = {"br": 9, "gzip": 9}
+ON_THE_FLY_LEVELS = {"br": 4, "gzip": 6}
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding for an Accept-Encoding header, or None."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    # mtime=0 keeps the output, and so the stored variant, deterministic
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def precompress(body: bytes, encoding: str) -> bytes:
+    return compress(body, encoding, PRECOMPRESS_LEVELS[encoding])
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    """
+    Encoded bodies differ byte-for-byte from the identity one, so their
+    ETag is weak; If-None-Match compares weakly, so it still matches.
+    """
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class CompressionStats:
+    """Counters shared with /health; the middleware itself is built lazily."""
+
+    def __init__(self, minimum_size: int = 1024):
+        self.minimum_size = minimum_size
+        self.compressed = 0
+        self.precompressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.by_encoding: Dict[str, int] = {e: 0 for e in ENCODINGS}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, precompressed: bool) -> None:
+        self.compressed += 1
+        self.precompressed += precompressed
+        self.by_encoding[encoding] += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "encodings": list(ENCODINGS),
+            "minimum_size": self.minimum_size,
+            "compressed": self.compressed,
+            "precompressed": self.precompressed,
+            "by_encoding": dict(self.by_encoding),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+        }
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-message responses. Streaming
+    responses, small bodies and already-encoded bodies pass through.
+    """
+
+    def __init__(self, app: ASGIApp, stats: CompressionStats, cache=None):
+        self.app = app
+        self.stats = stats
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[Message] = None
+        started = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, started
+            if started:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start = message
+            else:
+                started = True
+                if message["type"] != "http.response.body" or message.get("more_body", False):
+                    await send(start)
+                    await send(message)
+                else:
+                    await self._send_body(start, message, encoding, send)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _send_body(self, start: Message, message: Message, encoding: Optional[str], send: Send) -> None:
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=start["headers"])
+        content_type = headers.get("content-type", "")
+        if start["status"] == 304:
+            # A 304 has no body to measure; it must carry the ETag the 200
+            # would have (not_modified already adds Vary)
+            if encoding is not None:
+                _weaken_etag(headers)
+            await send(start)
+            await send(message)
+            return
+
+        if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+            await send(start)
+            await send(message)
+            return
+
+        # The representation depends on Accept-Encoding whether or not this
+        # client gets a compressed one
+        headers.add_vary_header("Accept-Encoding")
+        if encoding is None:
+            await send(start)
+            await send(message)
+            return
+
+        # Weak whenever an encoding was negotiated, even for bodies too small
+        # to compress, so a 304 for the same request can match it exactly.
+        # The response cache is keyed by the strong one.
+        etag = headers.get("etag")
+        _weaken_etag(headers)
+        if len(body) < self.stats.minimum_size:
+            await send(start)
+            await send(message)
+            return
+
+        data = None
+        if etag is not None and self.cache is not None:
+            data = self.cache.encoded(etag, body, encoding, precompress)
+        precompressed = data is not None
+        if not precompressed:
+            data = compress(body, encoding, ON_THE_FLY_LEVELS[encoding])
+        self.stats.record(encoding, len(body), len(data), precompressed)
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(data))
+        await send(start)
+        await send({"type": "http.response.body", "body": data})
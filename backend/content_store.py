@@ -0,0 +1,402 @@
+"""
+In-memory snapshot of the content collections.
+
+The catalog is small and changes rarely, so the API process loads every
+content collection at startup and serves list and slug lookups from dict
+indexes. The snapshot is reloaded when the version document in
+`content_meta` is bumped (e.g. by seed_content.py) or when it gets older
+than a maximum age, and is patched incrementally by ContentWatcher
+(content_watcher.py) as individual documents change.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from models import Product, Service, Lab, Page, STATUS_RANK
+
+logger = logging.getLogger(__name__)
+
+# Collections validated into models at load time
+CONTENT_MODELS = {
+    "products": Product,
+    "services": Service,
+    "labs": Lab,
+    "pages": Page,
+}
+
+# Redirects are served as raw documents
+COLLECTIONS = [*CONTENT_MODELS, "redirects"]
+
+# Document in db.content_meta whose "version" is bumped after content edits
+CONTENT_META_ID = "content"
+
+
+async def bump_content_version(db, now: Optional[datetime] = None) -> None:
+    """Tell running API processes to reload their content snapshot."""
+    await db.content_meta.update_one(
+        {"_id": CONTENT_META_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": now or datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+
+
+def _order(item: Any) -> int:
+    return item.order if item.order is not None else 999
+
+
+# Keyset ordering for paginated lists; the trailing id makes every key unique
+SORT_KEYS = {
+    "products": lambda p: (_order(p), STATUS_RANK.get(p.status.value, 999), p.name, p.id),
+    "services": lambda s: (_order(s), s.name, s.id),
+    "labs": lambda l: (_order(l), l.name, l.id),
+}
+
+# Load order, matching SORT_KEYS within each visibility. Every sort is
+# served by an index declared in indexes.py (products.status_rank is
+# maintained on write).
+LOAD_SORTS = {
+    "products": [("visibility", 1), ("order", 1), ("status_rank", 1), ("name", 1)],
+    "services": [("visibility", 1), ("order", 1), ("name", 1)],
+    "labs": [("visibility", 1), ("order", 1), ("name", 1)],
+    "pages": [("slug", 1)],
+    "redirects": [("_id", 1)],
+}
+
+# Component types of each sort key, for validating decoded cursors
+SORT_KEY_TYPES = {
+    "products": (int, int, str, str),
+    "services": (int, str, str),
+    "labs": (int, str, str),
+}
+
+# Filtered, sorted views kept per (collection, filters); dropped when exceeded
+MAX_VIEWS = 256
+
+
+class ContentStore:
+    """
+    Versioned in-memory snapshot of products, services, labs, pages and redirects.
+
+    Items are kept per collection in load order, keyed by MongoDB _id, with a
+    slug index for detail lookups. `version` increases on every change and
+    `versions[collection]` on every change to that collection, so callers
+    can key derived caches on them. Each item also carries a content
+    fingerprint, which (unlike the counters) is the same in every process
+    and is used for HTTP ETags.
+    """
+
+    def __init__(self, db, max_age: float = 300):
+        self.db = db
+        self.max_age = max_age
+        self.version = 0
+        self.versions: Dict[str, int] = {c: 0 for c in COLLECTIONS}
+        self.meta_version: Any = None
+        self.loaded_at: Optional[float] = None
+        self._items: Dict[str, Dict[Any, Any]] = {c: {} for c in COLLECTIONS}
+        self._fingerprints: Dict[str, Dict[Any, str]] = {c: {} for c in COLLECTIONS}
+        self._by_slug: Dict[str, Dict[str, Any]] = {c: {} for c in CONTENT_MODELS}
+        self._by_id: Dict[str, Dict[str, Any]] = {c: {} for c in CONTENT_MODELS}
+        self._digests: Dict[str, Tuple[int, str]] = {}
+        self._views: Dict[tuple, Tuple[int, List[tuple], List[Any]]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def load(self, force: bool = True) -> None:
+        """
+        Load every collection and swap the snapshot in atomically. With
+        force=False, callers that queued on the lock behind a load that
+        finished meanwhile return without loading again.
+        """
+        async with self._lock:
+            if not force and self.loaded:
+                return
+            meta_version = await self._read_meta_version()
+
+            items: Dict[str, Dict[Any, Any]] = {}
+            fingerprints: Dict[str, Dict[Any, str]] = {}
+            for collection in COLLECTIONS:
+                cursor = self.db[collection].find({}).sort(LOAD_SORTS[collection])
+                docs = await cursor.to_list(length=None)
+                items[collection] = {}
+                fingerprints[collection] = {}
+                for doc in docs:
+                    item = self._build_item(collection, doc)
+                    if item is not None:
+                        items[collection][doc["_id"]] = item
+                        fingerprints[collection][doc["_id"]] = _fingerprint(item)
+
+            # No awaits below: readers never observe a partial snapshot
+            self._items = items
+            self._fingerprints = fingerprints
+            self._by_slug = {
+                c: {item.slug: key for key, item in items[c].items()}
+                for c in CONTENT_MODELS
+            }
+            self._by_id = {
+                c: {item.id: key for key, item in items[c].items()}
+                for c in CONTENT_MODELS
+            }
+            self.meta_version = meta_version
+            self.loaded_at = time.monotonic()
+            for collection in COLLECTIONS:
+                self._bump(collection)
+
+        logger.info(
+            "Content snapshot v%s loaded: %s",
+            self.version,
+            ", ".join(f"{c}={len(items[c])}" for c in COLLECTIONS),
+        )
+
+    async def ensure_loaded(self) -> None:
+        """Load the snapshot on first use if startup could not."""
+        if not self.loaded:
+            await self.load(force=False)
+
+    async def refresh_if_stale(self) -> bool:
+        """Reload if the meta version changed or the snapshot is too old."""
+        if not self.loaded:
+            await self.load()
+            return True
+
+        too_old = time.monotonic() - self.loaded_at >= self.max_age
+        if too_old or await self._read_meta_version() != self.meta_version:
+            await self.load()
+            return True
+        return False
+
+    async def _read_meta_version(self) -> Any:
+        meta = await self.db.content_meta.find_one({"_id": CONTENT_META_ID})
+        return meta.get("version") if meta else None
+
+    def _build_item(self, collection: str, doc: dict) -> Any:
+        """Validate a raw document once, at load time."""
+        if collection not in CONTENT_MODELS:
+            return {k: v for k, v in doc.items() if k != "_id"}
+
+        try:
+            return CONTENT_MODELS[collection](**doc)
+        except ValidationError as e:
+            logger.error(
+                "Skipping invalid %s document %s: %s",
+                collection, doc.get("slug") or doc.get("_id"), e,
+            )
+            return None
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def upsert(self, collection: str, doc: dict) -> bool:
+        """Insert or replace one document. Returns True if anything changed."""
+        item = self._build_item(collection, doc)
+        if item is None:
+            # Now invalid: stop serving the previous version
+            return self.remove(collection, doc["_id"])
+
+        key = doc["_id"]
+        previous = self._items[collection].get(key)
+        if previous == item:
+            return False
+
+        self._items[collection][key] = item
+        self._fingerprints[collection][key] = _fingerprint(item)
+        if collection in self._by_slug:
+            if previous is not None and previous.slug != item.slug:
+                self._by_slug[collection].pop(previous.slug, None)
+            self._by_slug[collection][item.slug] = key
+            if previous is not None and previous.id != item.id:
+                self._by_id[collection].pop(previous.id, None)
+            self._by_id[collection][item.id] = key
+
+        self._bump(collection)
+        return True
+
+    def remove(self, collection: str, key: Any) -> bool:
+        """Drop one document by _id. Returns True if it was present."""
+        previous = self._items[collection].pop(key, None)
+        if previous is None:
+            return False
+
+        del self._fingerprints[collection][key]
+        if collection in self._by_slug and self._by_slug[collection].get(previous.slug) == key:
+            del self._by_slug[collection][previous.slug]
+        if collection in self._by_id and self._by_id[collection].get(previous.id) == key:
+            del self._by_id[collection][previous.id]
+
+        self._bump(collection)
+        return True
+
+    def replace_collection(self, collection: str, docs: List[dict]) -> bool:
+        """Swap a whole collection (used for redirects, which have no updated_at)."""
+        keys = {doc["_id"] for doc in docs}
+        changed = False
+        for key in [k for k in self._items[collection] if k not in keys]:
+            changed |= self.remove(collection, key)
+        for doc in docs:
+            changed |= self.upsert(collection, doc)
+        return changed
+
+    def max_updated_at(self, collection: str) -> Optional[datetime]:
+        """Newest updated_at in a content collection, for polling."""
+        stamps = [item.updated_at for item in self._items[collection].values()]
+        return max(stamps) if stamps else None
+
+    def _bump(self, collection: str) -> None:
+        self.versions[collection] += 1
+        self.version += 1
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def list(self, collection: str, limit: int = 0, **filters: Any) -> List[Any]:
+        """
+        Items matching every non-None filter by equality, in load order.
+        A limit of 0 means no limit (same as MongoDB).
+        """
+        active = {k: v for k, v in filters.items() if v is not None}
+        results = []
+        for item in self._items[collection].values():
+            if all(getattr(item, k, None) == v for k, v in active.items()):
+                results.append(item)
+                if limit > 0 and len(results) >= limit:
+                    break
+        return results
+
+    def page(
+        self,
+        collection: str,
+        limit: int = 0,
+        after: Optional[tuple] = None,
+        ids: Optional[FrozenSet[str]] = None,
+        **filters: Any,
+    ) -> Tuple[List[Any], int, Optional[tuple]]:
+        """
+        Keyset-paginated, sorted slice of the items matching `filters`
+        (and, if given, whose id is in `ids`).
+
+        Returns (items, total matching, sort key to resume after or None).
+        The filtered, sorted view is cached per collection version, so each
+        page costs a bisect plus a slice.
+        """
+        keys, items = self._view(collection, filters, ids)
+        start = bisect_right(keys, after) if after is not None else 0
+        end = start + limit if limit > 0 else len(items)
+        next_key = keys[end - 1] if end < len(items) else None
+        return items[start:end], len(items), next_key
+
+    def _view(
+        self, collection: str, filters: Dict[str, Any], ids: Optional[FrozenSet[str]] = None
+    ) -> Tuple[List[tuple], List[Any]]:
+        active = tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+        view_key = (collection, active, ids)
+        version = self.versions[collection]
+
+        cached = self._views.get(view_key)
+        if cached and cached[0] == version:
+            return cached[1], cached[2]
+
+        sort_key = SORT_KEYS[collection]
+        items = self.list(collection, **dict(active))
+        if ids is not None:
+            items = [item for item in items if item.id in ids]
+        items.sort(key=sort_key)
+        keys = [sort_key(item) for item in items]
+
+        if len(self._views) >= MAX_VIEWS:
+            self._views.clear()
+        self._views[view_key] = (version, keys, items)
+        return keys, items
+
+    def get(self, collection: str, slug: str) -> Optional[Any]:
+        """Look up a content item by slug."""
+        key = self._by_slug[collection].get(slug)
+        return self._items[collection].get(key) if key is not None else None
+
+    def get_by_id(self, collection: str, item_id: str) -> Optional[Any]:
+        """Look up a content item by its stable id (related_* references)."""
+        key = self._by_id[collection].get(item_id)
+        return self._items[collection].get(key) if key is not None else None
+
+    def entries(self, collection: str) -> List[Tuple[Any, str, Any]]:
+        """(_id, fingerprint, item) for every item, for derived indexes to diff."""
+        fingerprints = self._fingerprints[collection]
+        return [(key, fingerprints[key], item) for key, item in self._items[collection].items()]
+
+    def fingerprint(self, collection: str, slug: str) -> Optional[str]:
+        """Content hash of a single item, or None if the slug is unknown."""
+        key = self._by_slug[collection].get(slug)
+        return self._fingerprints[collection].get(key) if key is not None else None
+
+    def digest(self, collection: str) -> str:
+        """
+        Content hash of a whole collection, cached per version. Hashed in _id
+        order, not snapshot order: a live upsert appends where a reload
+        would sort, and both must give every instance the same ETag. List
+        order follows from the items' own sort fields, which are hashed.
+        """
+        version = self.versions[collection]
+        cached = self._digests.get(collection)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        fingerprints = self._fingerprints[collection]
+        h = hashlib.sha256()
+        for key in sorted(fingerprints, key=str):
+            h.update(fingerprints[key].encode())
+        digest = h.hexdigest()[:32]
+        self._digests[collection] = (version, digest)
+        return digest
+
+    def redirects(self, limit: Optional[int] = 1000) -> List[dict]:
+        """Raw redirect documents (without _id)."""
+        return list(self._items["redirects"].values())[:limit]
+
+
+def _fingerprint(item: Any) -> str:
+    """Stable hash of an item's served content."""
+    if isinstance(item, dict):
+        raw = json.dumps(item, sort_keys=True, default=str)
+    else:
+        raw = item.model_dump_json()
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def encode_cursor(key: tuple) -> str:
+    """Opaque cursor for a sort key returned by ContentStore.page()."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, collection: str) -> tuple:
+    """Inverse of encode_cursor. Raises ValueError on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    # Must have the same shape as the collection's sort key to be comparable
+    expected = SORT_KEY_TYPES[collection]
+    if (
+        not isinstance(key, list)
+        or len(key) != len(expected)
+        or not all(isinstance(v, t) and not isinstance(v, bool) for v, t in zip(key, expected))
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
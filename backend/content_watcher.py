@@ -0,0 +1,194 @@
+"""
+Keeps the in-memory ContentStore in sync with MongoDB.
+
+On replica sets (including Atlas) a single database-level change stream
+feeds inserts, updates and deletes into the store as they happen. Standalone
+servers don't support change streams, so the watcher falls back to polling
+`updated_at` plus the store's own version/max-age reload for deletions; it
+does the same when a stream repeatedly fails to open for other reasons.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from pymongo.errors import OperationFailure
+
+from content_store import CONTENT_MODELS, ContentStore
+
+logger = logging.getLogger(__name__)
+
+# Collections whose changes are applied to the store
+WATCHED_COLLECTIONS = ["products", "services", "labs", "pages", "redirects"]
+
+# A content_meta change (version bump) triggers a full reload
+META_COLLECTION = "content_meta"
+
+# Server error codes meaning change streams can't be used on this deployment
+CHANGE_STREAMS_UNSUPPORTED = {
+    40573,  # The $changeStream stage is only supported on replica sets
+    40324,  # Unrecognized pipeline stage name: '$changeStream'
+    115,    # CommandNotSupported
+}
+
+# Resume token no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = {280, 286}
+
+# Consecutive failures to open a change stream (errors mid-stream don't
+# count) before falling back to polling
+MAX_OPEN_FAILURES = 3
+
+
+class ContentWatcher:
+    """
+    Background task applying content changes to a ContentStore.
+
+    `source` can replace the MongoDB change stream: a callable taking the
+    last resume token (or None) and returning an async context manager that
+    yields change events shaped like MongoDB's. Tests use it to feed a fake
+    change-stream source.
+    """
+
+    def __init__(
+        self,
+        db,
+        store: ContentStore,
+        poll_interval: float = 15,
+        source: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.db = db
+        self.store = store
+        self.poll_interval = poll_interval
+        self.source = source or self._mongo_change_stream
+        self.mode: Optional[str] = None
+        self.events_applied = 0
+        self._resume_token: Any = None
+        self._stream_opened = False
+        self._last_seen: Dict[str, Optional[datetime]] = {}
+
+    async def run(self) -> None:
+        """Watch until cancelled, falling back to polling if needed."""
+        open_failures = 0
+        while True:
+            try:
+                await self._watch()
+            except asyncio.CancelledError:
+                raise
+            except (OperationFailure, NotImplementedError) as e:
+                if isinstance(e, NotImplementedError) or e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info("Change streams unavailable (%s); polling updated_at instead", e)
+                    await self._poll_forever()
+                    return
+                if e.code in CHANGE_STREAM_HISTORY_LOST:
+                    logger.warning("Change stream resume token expired; reloading content")
+                    self._resume_token = None
+                else:
+                    logger.exception("Content change stream failed")
+            except Exception:
+                logger.exception("Content change stream failed")
+            else:
+                continue
+
+            # Unrecognised errors opening the stream would otherwise retry
+            # forever while the snapshot goes stale
+            open_failures = 0 if self._stream_opened else open_failures + 1
+            if open_failures >= MAX_OPEN_FAILURES:
+                logger.warning(
+                    "Could not open a change stream %s times in a row; polling updated_at instead",
+                    open_failures,
+                )
+                await self._poll_forever()
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    # ------------------------------------------------------------------
+    # Change streams
+    # ------------------------------------------------------------------
+
+    def _mongo_change_stream(self, resume_token: Any):
+        pipeline = [{"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS + [META_COLLECTION]}}}]
+        return self.db.watch(
+            pipeline,
+            full_document="updateLookup",
+            resume_after=resume_token,
+        )
+
+    async def _watch(self) -> None:
+        self._stream_opened = False
+        async with self.source(self._resume_token) as stream:
+            self._stream_opened = True
+            if self.mode != "change_stream" or self._resume_token is None:
+                # Anything written between the last load and opening the
+                # stream would be missed, so reload once the stream is open.
+                self.mode = "change_stream"
+                await self.store.load()
+
+            async for change in stream:
+                await self.apply_change(change)
+                self._resume_token = change.get("_id")
+
+    async def apply_change(self, change: dict) -> None:
+        """Apply one change event to the store."""
+        operation = change.get("operationType")
+        collection = change.get("ns", {}).get("coll")
+        self.events_applied += 1
+
+        if operation in ("drop", "rename", "dropDatabase", "invalidate") or collection == META_COLLECTION:
+            await self.store.load()
+            if operation == "invalidate":
+                self._resume_token = None
+            return
+
+        if collection not in WATCHED_COLLECTIONS:
+            return
+
+        key = change.get("documentKey", {}).get("_id")
+        if operation in ("insert", "replace", "update"):
+            doc = change.get("fullDocument")
+            if doc is None:
+                # Deleted before the update lookup ran
+                self.store.remove(collection, key)
+            else:
+                self.store.upsert(collection, doc)
+        elif operation == "delete":
+            self.store.remove(collection, key)
+
+    # ------------------------------------------------------------------
+    # Polling fallback
+    # ------------------------------------------------------------------
+
+    async def _poll_forever(self) -> None:
+        self.mode = "polling"
+        await self.store.ensure_loaded()
+        self._reset_last_seen()
+
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Content polling failed")
+
+    async def poll_once(self) -> None:
+        """Pick up documents changed since the last poll."""
+        if await self.store.refresh_if_stale():
+            # Full reload (version bump / max age) also covers deletions
+            self._reset_last_seen()
+            return
+
+        for collection in CONTENT_MODELS:
+            since = self._last_seen.get(collection)
+            query = {"updated_at": {"$gte": since}} if since else {}
+            docs = await self.db[collection].find(query).to_list(length=None)
+            for doc in docs:
+                self.store.upsert(collection, doc)
+            self._last_seen[collection] = self.store.max_updated_at(collection)
+
+        # Redirects carry no updated_at; the collection is tiny, so diff it whole
+        redirects = await self.db.redirects.find({}).to_list(length=None)
+        self.store.replace_collection("redirects", redirects)
+
+    def _reset_last_seen(self) -> None:
+        self._last_seen = {c: self.store.max_updated_at(c) for c in CONTENT_MODELS}
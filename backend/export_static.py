@@ -0,0 +1,243 @@
+"""
+Static snapshot of the public catalog for edge/CDN serving.
+
+Requests every public content response from the app in-process (anonymous,
+so bodies and ETags are exactly what the API serves): product and service
+lists including their status/category filters and every cursor page,
+product, service and page details, redirects and compiled redirects. Each
+body is written under a content-hashed name next to gzip (and brotli, when
+installed) variants, and manifest.json maps each request route, query
+string included, to its files. A sitemap.xml is written alongside.
+
+Exports are incremental: a route whose source version (the item's
+updated_at, or the newest updated_at and item count of its collection) is
+unchanged since the previous manifest keeps its files without being
+rendered again. Labs, search and anything authenticated stay on the API.
+
+Usage:
+    python export_static.py [--out static-export] [--site-url https://relvanta.com]
+                            [--full] [--prune]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape
+
+os.environ.setdefault("MDX_RENDER_WORKERS", "0")
+
+import httpx
+
+import server
+from compression import ENCODINGS, precompress
+from models import Visibility
+
+MANIFEST = "manifest.json"
+SITEMAP = "sitemap.xml"
+
+# Gzip/brotli file suffix per content encoding
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+# Collections exported with list and detail routes, and their site paths
+LISTED = {"products": "/products", "services": "/services"}
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._=-]+")
+
+
+def route_stem(route: str) -> str:
+    """/api/content/products/oneeye?x=1 -> products/oneeye~x=1"""
+    path, _, query = route.partition("?")
+    stem = path.removeprefix("/api/content/")
+    return stem + ("~" + _UNSAFE.sub("_", query) if query else "")
+
+
+def write_files(out: Path, stem: str, body: bytes, suffix: str) -> Tuple[str, Dict[str, str]]:
+    """Write body and its compressed variants under a content-hashed name."""
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    name = f"{stem}.{digest}{suffix}"
+    path = out / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Content-addressed: an existing file already holds these bytes
+    if not path.exists():
+        path.write_bytes(body)
+    variants = {}
+    for encoding in ENCODINGS:
+        variant = name + ENCODING_SUFFIXES[encoding]
+        if not (out / variant).exists():
+            (out / variant).write_bytes(precompress(body, encoding))
+        variants[encoding] = variant
+    return name, variants
+
+
+def _newest(items: List[Any]) -> str:
+    return max((item.updated_at for item in items), default=datetime.min).isoformat()
+
+
+def source_versions() -> Dict[str, str]:
+    """Per-collection version of list routes: newest updated_at plus count."""
+    store = server.content_store
+    versions = {}
+    for collection in (*LISTED, "pages"):
+        items = store.list(collection)
+        versions[collection] = f"{_newest(items)}|{len(items)}"
+    # Redirect documents carry no timestamps
+    versions["redirects"] = store.digest("redirects")
+    return versions
+
+
+def planned_routes() -> List[Tuple[str, str]]:
+    """(route, source version) for every first-page and detail route."""
+    store = server.content_store
+    versions = source_versions()
+    public = Visibility.PUBLIC.value
+    routes = []
+
+    for collection in LISTED:
+        items = store.list(collection, visibility=public)
+        base = f"/api/content/{collection}"
+        queries = [{}, {"visibility": public}]
+        if collection == "products":
+            queries += [{"status": s} for s in sorted({p.status.value for p in items})]
+            queries += [{"category": c} for c in sorted({p.category for p in items})]
+        for query in queries:
+            routes.append((f"{base}?{urlencode(query)}" if query else base, versions[collection]))
+        for item in items:
+            routes.append((f"{base}/{item.slug}", item.updated_at.isoformat()))
+
+    for page in store.list("pages", visibility=public):
+        routes.append((f"/api/content/pages/{page.slug}", page.updated_at.isoformat()))
+
+    routes.append(("/api/content/redirects", versions["redirects"]))
+    routes.append(("/api/content/redirects/compiled", versions["redirects"]))
+    return routes
+
+
+def next_route(route: str, body: bytes) -> Optional[str]:
+    """Route of the following page of a list response, if any."""
+    try:
+        cursor = json.loads(body).get("next_cursor")
+    except (ValueError, AttributeError):
+        return None
+    if not cursor:
+        return None
+    path, _, query = route.partition("?")
+    params = [p for p in query.split("&") if p and not p.startswith("cursor=")]
+    return f"{path}?{'&'.join(params + [urlencode({'cursor': cursor})])}"
+
+
+def sitemap(site_url: str) -> bytes:
+    store = server.content_store
+    public = Visibility.PUBLIC.value
+    entries: List[Tuple[str, Optional[datetime]]] = [(site_url + "/", None)]
+    for collection, path in LISTED.items():
+        items = store.list(collection, visibility=public)
+        entries.append((site_url + path, max((i.updated_at for i in items), default=None)))
+        entries += [(f"{site_url}{path}/{i.slug}", i.updated_at) for i in items]
+    entries += [(f"{site_url}/{p.slug}", p.updated_at) for p in store.list("pages", visibility=public)]
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for url, updated_at in entries:
+        lastmod = f"<lastmod>{updated_at.date().isoformat()}</lastmod>" if updated_at else ""
+        lines.append(f"  <url><loc>{escape(url)}</loc>{lastmod}</url>")
+    lines.append("</urlset>")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def export(args: argparse.Namespace) -> Dict[str, int]:
+    out: Path = args.out
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / MANIFEST
+    previous: Dict[str, dict] = {}
+    if manifest_path.exists() and not args.full:
+        previous = json.loads(manifest_path.read_text()).get("routes", {})
+
+    await server.content_store.load()
+    counts = {"rendered": 0, "reused": 0, "removed": 0}
+    routes: Dict[str, dict] = {}
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://export") as client:
+        queue = planned_routes()
+        while queue:
+            route, source = queue.pop(0)
+            entry = previous.get(route)
+            if entry and entry["source"] == source and (out / entry["file"]).exists():
+                counts["reused"] += 1
+            else:
+                response = await client.get(route, headers={"Accept-Encoding": "identity"})
+                response.raise_for_status()
+                file, variants = write_files(out, route_stem(route), response.content, ".json")
+                entry = {
+                    "file": file,
+                    "encodings": variants,
+                    "etag": response.headers.get("ETag"),
+                    "bytes": len(response.content),
+                    "source": source,
+                    "next": next_route(route, response.content),
+                }
+                counts["rendered"] += 1
+            routes[route] = entry
+            if entry["next"]:
+                queue.append((entry["next"], source))
+
+    file, variants = write_files(out, "sitemap", sitemap(args.site_url.rstrip("/")), ".xml")
+    routes["/" + SITEMAP] = {"file": file, "encodings": variants, "source": None, "next": None}
+    # Fixed name for crawlers; the hashed copy is what the manifest points at
+    (out / SITEMAP).write_bytes((out / file).read_bytes())
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "content_version": server.content_store.version,
+        "routes": routes,
+    }
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    tmp.replace(manifest_path)
+
+    if args.prune:
+        # Only after the new manifest is in place, so readers never miss a file
+        keep = {MANIFEST, SITEMAP}
+        for entry in routes.values():
+            keep.add(entry["file"])
+            keep.update(entry["encodings"].values())
+        for path in out.rglob("*"):
+            if path.is_file() and path.relative_to(out).as_posix() not in keep:
+                path.unlink()
+                counts["removed"] += 1
+    return counts
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", type=Path, default=Path("static-export"))
+    parser.add_argument("--site-url", default=os.environ.get("SITE_URL", "https://relvanta.com"))
+    parser.add_argument("--full", action="store_true", help="ignore the previous manifest")
+    parser.add_argument("--prune", action="store_true", help="delete files the new manifest no longer references")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    try:
+        counts = await export(args)
+    finally:
+        server.client.close()
+    print(
+        f"✅ Exported to {args.out}: {counts['rendered']} rendered, {counts['reused']} reused, "
+        f"{counts['removed']} removed in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
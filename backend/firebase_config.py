@@ -1,34 +1,39 @@
 """Firebase Admin SDK initialization for backend token verification."""
+import asyncio
 import base64
+import hashlib
 import os
 import json
 import logging
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 import firebase_admin
 from firebase_admin import credentials, auth
 
 logger = logging.getLogger(__name__)
 
 def initialize_firebase():
+    """Initialize the default Firebase app once; returns it, or None if unconfigured."""
     if firebase_admin._apps:
-        return
+        return firebase_admin.get_app()
 
     # Option 1: JSON via env (recommended)
     b64_json = os.getenv("FIREBASE_CREDENTIALS_JSON")
     if b64_json:
         cred_dict = json.loads(base64.b64decode(b64_json))
         cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
+        app = firebase_admin.initialize_app(cred)
         logger.info("✅ Firebase initialized using FIREBASE_CREDENTIALS_JSON")
-        return
+        return app
 
     # Option 2: Path to file (only useful locally)
     path = os.getenv("FIREBASE_CREDENTIALS_PATH")
     if path and os.path.exists(path):
         cred = credentials.Certificate(path)
-        firebase_admin.initialize_app(cred)
+        app = firebase_admin.initialize_app(cred)
         logger.info("✅ Firebase initialized using FIREBASE_CREDENTIALS_PATH")
-        return
+        return app
 
     # No credentials
     logger.warning(
@@ -36,10 +41,62 @@ def initialize_firebase():
         "Set FIREBASE_CREDENTIALS_PATH or FIREBASE_CREDENTIALS_JSON. "
         "Authentication will not work until configured."
     )
+    return None
 
-def verify_firebase_token(id_token: str) -> Optional[dict]:
+
+class VerifiedTokenMemo:
+    """
+    Short-lived memo of successfully verified ID tokens, keyed by SHA-256.
+
+    Login bursts (retries, several tabs) present the same token repeatedly;
+    the memo answers those without re-running signature verification. An
+    entry never outlives the token's own `exp` claim.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(id_token: str) -> str:
+        return hashlib.sha256(id_token.encode()).hexdigest()
+
+    def get(self, id_token: str) -> Optional[dict]:
+        key = self._key(id_token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, valid_until = entry
+        if time.time() >= valid_until:
+            del self._entries[key]
+            return None
+        return claims
+
+    def set(self, id_token: str, claims: dict) -> None:
+        if self.max_size <= 0:
+            return
+        valid_until = min(time.time() + self.ttl_seconds, float(claims.get("exp", 0)))
+        key = self._key(id_token)
+        self._entries[key] = (claims, valid_until)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+verified_tokens = VerifiedTokenMemo(
+    ttl_seconds=float(os.getenv("FIREBASE_TOKEN_MEMO_SECONDS", "300")),
+)
+
+
+async def verify_firebase_token(id_token: str) -> Optional[dict]:
     """
-    Verify Firebase ID token.
+    Verify Firebase ID token without blocking the event loop.
+
+    The Admin SDK verifies synchronously and may fetch Google's signing
+    certificates, so it runs in a worker thread. The SDK keeps those
+    certificates in an in-memory HTTP cache that honours their
+    Cache-Control max-age, so a fetch only happens when Google rotates keys.
     
     Args:
         id_token: The Firebase ID token to verify
@@ -47,6 +104,17 @@ def verify_firebase_token(id_token: str) -> Optional[dict]:
     Returns:
         Decoded token claims or None if verification fails
     """
+    claims = verified_tokens.get(id_token)
+    if claims is not None:
+        return claims
+
+    claims = await asyncio.to_thread(_verify_firebase_token_sync, id_token)
+    if claims is not None:
+        verified_tokens.set(id_token, claims)
+    return claims
+
+
+def _verify_firebase_token_sync(id_token: str) -> Optional[dict]:
     app = initialize_firebase()
     
     if not app:
@@ -0,0 +1,50 @@
+"""
+HTTP caching helpers for the content endpoints: strong ETags, conditional
+GET (If-None-Match -> 304) and Cache-Control policies.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Public content: shared caches and ISR may reuse a response for a minute
+# and keep serving it while revalidating in the background.
+PUBLIC_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+# Redirects change even less often; the Next.js proxy refreshes every 5 min.
+REDIRECTS_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=600"
+
+# Authenticated / non-public content must not be stored by shared caches.
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the content version plus anything shaping the body."""
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110, section 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    A bodiless 304 if the client already holds this representation. It
+    carries the Vary the 200 would; CompressionMiddleware weakens the ETag
+    the same way when an encoding was negotiated.
+    """
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"},
+    )
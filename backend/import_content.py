@@ -0,0 +1,393 @@
+"""
+Incremental content import.
+
+Reads content from JSON, NDJSON and Markdown-with-frontmatter files,
+validates every document with the models.py classes in a process pool,
+diffs against MongoDB by id (redirects: by "from") and content hash, and
+writes only what changed with batched bulk_write upserts. Unlike
+seed_content.py nothing is wiped first, so the site never serves empty
+lists during a content deploy.
+
+Input layout (files and directories may be mixed):
+    content/products.json          [{...}, ...] or {"products": [...], ...}
+    content/services.ndjson        one document per line
+    content/pages/about.md         YAML frontmatter + Markdown body
+The collection comes from a "collection" field, else the file name
+(products.json), else the parent directory (pages/about.md). A Markdown
+body becomes the collection's MDX field (products.long_description,
+services/labs.description, pages.content).
+
+Usage:
+    python import_content.py content/ [--dry-run] [--prune] [--skip-invalid]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import ValidationError
+from pymongo import DeleteMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from content_store import CONTENT_MODELS, COLLECTIONS, bump_content_version
+from indexes import ensure_indexes
+from models import Redirect, status_rank
+from rendered_content import MDX_FIELDS
+
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+# Field identifying a document across imports
+KEY_FIELDS = {**{c: "id" for c in CONTENT_MODELS}, "redirects": "from"}
+
+# Stored on content documents so the diff only reads ids and hashes;
+# redirects are served raw, so theirs is computed from the stored document
+HASH_FIELD = "content_hash"
+
+# Set by the import, so excluded from the content hash
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+SUFFIXES = {".json", ".ndjson", ".jsonl", ".md", ".mdx", ".markdown"}
+
+VALIDATE_CHUNK = 200
+
+# A raw document and where it came from ("path:line")
+Record = Tuple[str, str, dict]
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def _collection_for(path: Path, doc: dict) -> Optional[str]:
+    collection = doc.pop("collection", None)
+    if collection:
+        return collection
+    if path.stem in COLLECTIONS:
+        return path.stem
+    if path.parent.name in COLLECTIONS:
+        return path.parent.name
+    return None
+
+
+def _frontmatter(text: str) -> Tuple[dict, str]:
+    """Split "---\\nyaml\\n---\\nbody" into (metadata, body)."""
+    if not text.startswith("---"):
+        return {}, text
+    _, _, rest = text.partition("\n")
+    meta, sep, body = rest.partition("\n---")
+    if not sep:
+        return {}, text
+    return yaml.safe_load(meta) or {}, body.partition("\n")[2].lstrip("\n")
+
+
+def _docs_in(path: Path) -> Iterator[Tuple[str, dict]]:
+    """(source, raw document) for every document in one file."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".ndjson", ".jsonl"):
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if line.strip():
+                yield f"{path}:{line_no}", json.loads(line)
+    elif path.suffix == ".json":
+        data = json.loads(text)
+        if isinstance(data, dict) and data and all(k in COLLECTIONS for k in data):
+            for collection, docs in data.items():
+                for i, doc in enumerate(docs):
+                    yield f"{path}[{collection}][{i}]", {"collection": collection, **doc}
+        elif isinstance(data, list):
+            for i, doc in enumerate(data):
+                yield f"{path}[{i}]", doc
+        else:
+            yield str(path), data
+    else:
+        meta, body = _frontmatter(text)
+        collection = _collection_for(path, meta)
+        if collection in MDX_FIELDS and body.strip():
+            meta.setdefault(MDX_FIELDS[collection], body)
+        if collection:
+            meta["collection"] = collection
+        yield str(path), meta
+
+
+def read_inputs(paths: List[Path]) -> Tuple[Dict[str, List[Record]], List[str]]:
+    """Raw documents grouped by collection, plus read errors."""
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in SUFFIXES))
+        else:
+            files.append(path)
+
+    records: Dict[str, List[Record]] = {}
+    errors = []
+    for path in files:
+        try:
+            for source, doc in _docs_in(path):
+                if not isinstance(doc, dict):
+                    errors.append(f"{source}: not an object")
+                    continue
+                collection = _collection_for(path, doc)
+                if collection not in KEY_FIELDS:
+                    errors.append(f"{source}: unknown collection {collection!r}")
+                    continue
+                records.setdefault(collection, []).append((collection, source, doc))
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            errors.append(f"{path}: {e}")
+    return records, errors
+
+
+# ---------------------------------------------------------------------------
+# Validation (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+
+def _plain(value: Any) -> Any:
+    """Model dump -> BSON-ready values (enums to their values)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def content_hash(doc: dict) -> str:
+    """Hash of everything an import sets except timestamps."""
+    hashed = {
+        k: v for k, v in doc.items()
+        if k not in TIMESTAMP_FIELDS and k not in ("_id", HASH_FIELD)
+    }
+    raw = json.dumps(hashed, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def validate_chunk(records: List[Record], now: datetime) -> List[Tuple[str, str, Any]]:
+    """
+    Validate raw documents. Returns ("ok", collection, document) with the
+    normalized document, or ("error", source, message).
+    """
+    results = []
+    for collection, source, raw in records:
+        try:
+            if collection == "redirects":
+                doc = _plain(Redirect(**raw).model_dump(by_alias=True))
+            else:
+                # Timestamps are optional in import files; the diff ignores them
+                stamped = {"created_at": now, "updated_at": now, **raw}
+                item = CONTENT_MODELS[collection](**stamped)
+                # Only what the file sets, so defaults are not written as nulls
+                doc = _plain(item.model_dump(by_alias=True, exclude_unset=True))
+                for field in TIMESTAMP_FIELDS:
+                    if field not in raw:
+                        del doc[field]
+                if collection == "products":
+                    doc["status_rank"] = status_rank(doc["status"])
+            results.append(("ok", collection, doc))
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            results.append(("error", source, errors))
+        except (TypeError, ValueError) as e:
+            results.append(("error", source, str(e)))
+    return results
+
+
+def validate(records: Dict[str, List[Record]], workers: int) -> Tuple[Dict[str, List[dict]], List[str]]:
+    """Validate every record, in a process pool when workers > 0."""
+    now = datetime.now(timezone.utc)
+    chunks = [
+        batch[i:i + VALIDATE_CHUNK]
+        for batch in records.values()
+        for i in range(0, len(batch), VALIDATE_CHUNK)
+    ]
+
+    if workers > 0 and len(chunks) > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            outcomes = list(pool.map(validate_chunk, chunks, [now] * len(chunks)))
+    else:
+        outcomes = [validate_chunk(chunk, now) for chunk in chunks]
+
+    valid: Dict[str, List[dict]] = {}
+    errors = []
+    for outcome in outcomes:
+        for status, where, value in outcome:
+            if status == "ok":
+                valid.setdefault(where, []).append(value)
+            else:
+                errors.append(f"{where}: {value}")
+    return valid, errors
+
+
+# ---------------------------------------------------------------------------
+# Diff and apply
+# ---------------------------------------------------------------------------
+
+
+async def stored_hashes(db, collection: str) -> Dict[Any, str]:
+    key = KEY_FIELDS[collection]
+    if collection == "redirects":
+        cursor = db[collection].find({}, {"_id": 0})
+        return {doc.get(key): content_hash(doc) async for doc in cursor}
+    cursor = db[collection].find({}, {"_id": 0, key: 1, HASH_FIELD: 1})
+    return {doc.get(key): doc.get(HASH_FIELD) async for doc in cursor}
+
+
+def model_fields(collection: str) -> List[str]:
+    """Stored field names of a content collection, timestamps excluded."""
+    fields = [
+        info.alias or name
+        for name, info in CONTENT_MODELS[collection].model_fields.items()
+        if (info.alias or name) not in TIMESTAMP_FIELDS
+    ]
+    if collection == "products":
+        fields.append("status_rank")
+    return fields
+
+
+def plan(collection: str, docs: List[dict], existing: Dict[Any, str], prune: bool, now: datetime) -> Tuple[List[Any], Dict[str, int]]:
+    """bulk_write operations turning the stored collection into docs."""
+    key = KEY_FIELDS[collection]
+    operations = []
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    # Documents only carry the fields their file sets (defaults are not
+    # written), so a field dropped from the input must be removed explicitly
+    fields = model_fields(collection) if collection != "redirects" else []
+
+    for doc in docs:
+        digest = content_hash(doc)
+        stored = existing.get(doc[key], False)
+        if stored == digest:
+            counts["unchanged"] += 1
+            continue
+        counts["updated" if stored is not False else "inserted"] += 1
+
+        update = dict(doc)
+        on_insert = {}
+        if collection != "redirects":
+            update[HASH_FIELD] = digest
+            update.setdefault("updated_at", now)
+            if "created_at" not in update:
+                on_insert["created_at"] = now
+        operation = {"$set": update}
+        dropped = {field: "" for field in fields if field not in update}
+        if dropped:
+            operation["$unset"] = dropped
+        if on_insert:
+            operation["$setOnInsert"] = on_insert
+        operations.append(UpdateOne({key: doc[key]}, operation, upsert=True))
+
+    if prune:
+        wanted = {doc[key] for doc in docs}
+        gone = [k for k in existing if k not in wanted]
+        if gone:
+            operations.append(DeleteMany({key: {"$in": gone}}))
+            counts["deleted"] = len(gone)
+    return operations, counts
+
+
+async def apply(db, collection: str, operations: List[Any], batch_size: int) -> List[str]:
+    errors = []
+    for start in range(0, len(operations), batch_size):
+        try:
+            await db[collection].bulk_write(operations[start:start + batch_size], ordered=False)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                errors.append(f"{collection}: {err.get('errmsg')}")
+    return errors
+
+
+def duplicate_keys(valid: Dict[str, List[dict]]) -> List[str]:
+    errors = []
+    for collection, docs in valid.items():
+        key = KEY_FIELDS[collection]
+        seen = set()
+        for doc in docs:
+            if doc[key] in seen:
+                errors.append(f"{collection}: duplicate {key} {doc[key]!r} in input")
+            seen.add(doc[key])
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+
+async def import_content(args: argparse.Namespace) -> int:
+    records, errors = read_inputs(args.paths)
+    total = sum(len(r) for r in records.values())
+    print(f"📂 Read {total} documents from {len(args.paths)} path(s)")
+
+    valid, invalid = validate(records, args.workers)
+    errors += invalid + duplicate_keys(valid)
+    for error in errors:
+        print(f"❌ {error}")
+    if errors and not args.skip_invalid:
+        print(f"\n🛑 {len(errors)} problem(s); nothing written (use --skip-invalid to import the rest)")
+        return 1
+
+    load_dotenv(Path(__file__).parent / ".env")
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+    print(f"📦 DB_NAME    : {os.environ['DB_NAME']}")
+
+    if not args.dry_run:
+        await ensure_indexes(db)
+
+    now = datetime.now(timezone.utc)
+    changed = 0
+    write_errors = []
+    for collection in COLLECTIONS:
+        if collection not in valid:
+            continue
+        existing = await stored_hashes(db, collection)
+        operations, counts = plan(collection, valid[collection], existing, args.prune, now)
+        print(
+            f"{'🔍' if args.dry_run else '✅'} {collection:10} "
+            + ", ".join(f"{v} {k}" for k, v in counts.items())
+        )
+        if operations and not args.dry_run:
+            write_errors += await apply(db, collection, operations, args.batch_size)
+        changed += len(operations)
+
+    for error in write_errors:
+        print(f"❌ {error}")
+
+    if changed and not args.dry_run:
+        await bump_content_version(db, now)
+
+    client.close()
+    print("\n🎉 Import complete" if not args.dry_run else "\n🔍 Dry run: nothing written")
+    return 1 if write_errors else 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", type=Path, help="content files or directories")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    parser.add_argument("--prune", action="store_true",
+                        help="delete stored documents missing from the input (per imported collection)")
+    parser.add_argument("--skip-invalid", action="store_true", help="import valid documents despite errors")
+    parser.add_argument("--batch-size", type=int, default=500, help="operations per bulk_write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="validation processes (0 validates in-process)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(import_content(parse_args())))
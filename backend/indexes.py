@@ -0,0 +1,202 @@
+"""
+Index declarations for every query the API runs.
+
+The API reconciles these at startup (creating anything missing), so
+production no longer depends on whoever last ran seed_content.py.
+
+Diagnostics:
+    python indexes.py            # create/verify indexes
+    python indexes.py --explain  # explain() every API query, exit 1 on COLLSCAN
+"""
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from content_store import LOAD_SORTS
+from sessions import session_lookup_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Indexes that can't be built as declared: an existing index with the same
+# name/keys but other options (85, 86), or duplicate data for a unique one
+UNRECONCILABLE_CODES = {85, 86, 11000}
+
+
+def _content_indexes(collection: str) -> List[IndexModel]:
+    return [
+        IndexModel("slug", unique=True),
+        # Snapshot load order (ContentStore.load); also serves visibility filters
+        IndexModel(LOAD_SORTS[collection]),
+        # Polling fallback (ContentWatcher.poll_once)
+        IndexModel("updated_at"),
+    ]
+
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "products": _content_indexes("products"),
+    "services": _content_indexes("services"),
+    "labs": _content_indexes("labs"),
+    "pages": [
+        IndexModel("slug", unique=True),
+        IndexModel("updated_at"),
+    ],
+    "redirects": [
+        IndexModel("from", unique=True),
+    ],
+    "user_sessions": [
+        IndexModel("session_token", unique=True),
+        # TTL: MongoDB removes a session once expires_at has passed
+        IndexModel("expires_at", expireAfterSeconds=0),
+    ],
+    "users": [
+        IndexModel("user_id", unique=True),
+        IndexModel("email", unique=True),
+    ],
+    "client_access": [
+        IndexModel("user_id", unique=True),
+    ],
+}
+
+
+async def ensure_indexes(db) -> List[str]:
+    """
+    Create any declared index that is missing.
+
+    Creating an index that already exists with the same options is a no-op.
+    Conflicting definitions and unique indexes blocked by duplicate data are
+    logged and left alone rather than dropped, since rebuilding an index or
+    cleaning data is an operator decision. Returns the names of
+    indexes that could not be reconciled.
+    """
+    problems = []
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                if e.code not in UNRECONCILABLE_CODES:
+                    raise
+                logger.warning("Index %s.%s could not be reconciled: %s", collection, name, e)
+                problems.append(f"{collection}.{name}")
+
+        declared = {m.document["name"] for m in models} | {"_id_"}
+        existing = await db[collection].index_information()
+        for extra in sorted(set(existing) - declared):
+            logger.info("Index %s.%s exists but is not declared in indexes.py", collection, extra)
+
+    return problems
+
+
+# ----------------------------------------------------------------------------
+# Query plan verification
+# ----------------------------------------------------------------------------
+
+def api_queries() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(description, collection, query) for every query issued by server.py."""
+    now = datetime.now(timezone.utc)
+    queries: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    for collection, sort in LOAD_SORTS.items():
+        queries.append((f"content snapshot load ({collection})", collection, {"filter": {}, "sort": sort}))
+    for collection in ("products", "services", "labs", "pages"):
+        queries.append((
+            f"content polling ({collection})",
+            collection,
+            {"filter": {"updated_at": {"$gte": now}}},
+        ))
+
+    queries += [
+        ("get_current_user", "user_sessions", {"pipeline": session_lookup_pipeline("sess_x", now)}),
+        ("get_current_user $lookup", "users", {"filter": {"user_id": "user_x"}}),
+        ("logout / expired session delete", "user_sessions", {"filter": {"session_token": "sess_x"}}),
+        ("create_session user lookup", "users", {"filter": {"email": "x@example.com"}}),
+        ("get_current_user $lookup / get_client_access", "client_access", {"filter": {"user_id": "user_x"}}),
+    ]
+    return queries
+
+
+def _winning_plans(explain: Any) -> List[dict]:
+    """Collect every winningPlan in an explain() result (find or aggregate)."""
+    plans = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                plans.append(value)
+            else:
+                plans += _winning_plans(value)
+    elif isinstance(explain, list):
+        for value in explain:
+            plans += _winning_plans(value)
+    return plans
+
+
+def _stages(plan: Any) -> List[str]:
+    if isinstance(plan, dict):
+        found = [plan["stage"]] if "stage" in plan else []
+        for value in plan.values():
+            found += _stages(value)
+        return found
+    if isinstance(plan, list):
+        return [s for value in plan for s in _stages(value)]
+    return []
+
+
+async def explain_queries(db) -> List[str]:
+    """Explain every API query; return the descriptions that COLLSCAN."""
+    failures = []
+    for description, collection, query in api_queries():
+        if "pipeline" in query:
+            explain = await db.command(
+                "aggregate", collection, pipeline=query["pipeline"], explain=True
+            )
+        else:
+            cursor = db[collection].find(query["filter"])
+            if query.get("sort"):
+                cursor = cursor.sort(query["sort"])
+            explain = await cursor.explain()
+
+        stages = [s for plan in _winning_plans(explain) for s in _stages(plan)]
+        verdict = "COLLSCAN" if "COLLSCAN" in stages else "ok"
+        print(f"{verdict:9} {collection:14} {description}  [{' > '.join(stages)}]")
+        if verdict == "COLLSCAN":
+            failures.append(description)
+    return failures
+
+
+async def main(argv: List[str]) -> int:
+    if os.getenv("PYTHON_ENV") != "production":
+        load_dotenv(Path(__file__).parent / ".env")
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+    try:
+        problems = await ensure_indexes(db)
+        if problems:
+            print("❌ Indexes not reconciled:", ", ".join(problems))
+            return 1
+        print("✅ Indexes reconciled")
+
+        if "--explain" in argv:
+            failures = await explain_queries(db)
+            if failures:
+                print("❌ Collection scans:", ", ".join(failures))
+                return 1
+            print("✅ No query uses a collection scan")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
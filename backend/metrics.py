@@ -0,0 +1,396 @@
+"""
+Request and MongoDB metrics in the Prometheus text format.
+
+MetricsMiddleware counts and times every request, labelled by the route
+template (/api/content/products/{slug}) rather than the raw path so label
+cardinality stays bounded. MongoCommandMonitor is a pymongo
+CommandListener: Motor runs each operation on an executor thread inside a
+copy of the caller's context, so the per-request tally the middleware puts
+in a contextvar also receives the commands that request issued.
+MongoPoolMonitor tracks connection checkout waits and connections in use.
+Cache statistics are read from the caches' own stats() when /metrics
+renders.
+"""
+import hashlib
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# MongoDB commands issued by one request
+COMMAND_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50)
+
+# Fields of the caches' stats() exported per cache: (metric, type, help)
+CACHE_FIELDS = {
+    "hits": ("cache_hits_total", "counter", "Lookups answered from the cache"),
+    "misses": ("cache_misses_total", "counter", "Lookups that missed the cache"),
+    "hit_ratio": ("cache_hit_ratio", "gauge", "Hits over lookups since startup"),
+    "size": ("cache_entries", "gauge", "Entries currently cached"),
+}
+
+COMPRESSION_FIELDS = {
+    "compressed": ("compression_responses_total", "counter", "Responses sent compressed"),
+    "precompressed": ("compression_precompressed_total", "counter", "Compressed responses served from the response cache"),
+    "bytes_in": ("compression_bytes_in_total", "counter", "Uncompressed bytes of compressed responses"),
+    "bytes_out": ("compression_bytes_out_total", "counter", "Bytes sent for compressed responses"),
+    "bytes_saved": ("compression_bytes_saved_total", "counter", "Bytes saved by compression"),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic value per label set. Command and pool events arrive on driver threads, so updates lock."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge:
+    """Up/down value per label set. Pool events arrive on driver threads, so updates lock."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations per label set; observe() and render() lock like Counter."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bucket] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = _labels(self.labels, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            total = cumulative + series[-2]
+            inf = _labels(self.labels, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {total}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {total}")
+        return lines
+
+
+class RequestTally:
+    """MongoDB work attributed to the request being handled."""
+
+    __slots__ = ("commands", "seconds")
+
+    def __init__(self):
+        self.commands = 0
+        self.seconds = 0.0
+
+
+_current_request: ContextVar[Optional[RequestTally]] = ContextVar("current_request", default=None)
+
+
+class Metrics:
+    """Registry of the API's metrics."""
+
+    def __init__(self):
+        self.requests = Counter(
+            "http_requests_total", "HTTP requests handled", ("method", "route", "status"),
+        )
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "HTTP request latency",
+            ("method", "route"), LATENCY_BUCKETS,
+        )
+        self.request_commands = Histogram(
+            "http_request_mongo_commands", "MongoDB commands issued per request",
+            ("route",), COMMAND_COUNT_BUCKETS,
+        )
+        self.request_mongo_duration = Histogram(
+            "http_request_mongo_seconds", "Time per request spent waiting on MongoDB",
+            ("route",), LATENCY_BUCKETS,
+        )
+        self.commands = Counter(
+            "mongo_commands_total", "MongoDB commands by collection and outcome",
+            ("collection", "command", "outcome"),
+        )
+        self.command_duration = Histogram(
+            "mongo_command_duration_seconds", "MongoDB command latency",
+            ("collection", "command"), LATENCY_BUCKETS,
+        )
+        self.pool_checkout_wait = Histogram(
+            "mongo_pool_checkout_wait_seconds", "Time waiting for a pooled MongoDB connection",
+            ("server",), LATENCY_BUCKETS,
+        )
+        self.pool_checkout_failures = Counter(
+            "mongo_pool_checkout_failures_total", "Connection checkouts that failed",
+            ("server", "reason"),
+        )
+        self.pool_in_use = Gauge(
+            "mongo_pool_connections_in_use", "Pooled connections checked out", ("server",),
+        )
+        self.pool_open = Gauge(
+            "mongo_pool_connections", "Open pooled connections", ("server",),
+        )
+        self.pool_waiting = Gauge(
+            "mongo_pool_checkouts_waiting", "Operations waiting for a connection", ("server",),
+        )
+        self._stats: List[Tuple[Dict[str, Tuple[str, str, str]], str, str, Callable[[], Dict[str, Any]]]] = []
+
+    def register_cache(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Export hits/misses/hit_ratio/size from a cache's stats() as cache=name."""
+        self._stats.append((CACHE_FIELDS, "cache", name, stats))
+
+    def register_compression(self, stats: Callable[[], Dict[str, Any]]) -> None:
+        self._stats.append((COMPRESSION_FIELDS, "", "", stats))
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, tally: RequestTally) -> None:
+        self.requests.inc(method, route, str(status))
+        self.request_duration.observe(seconds, method, route)
+        self.request_commands.observe(tally.commands, route)
+        self.request_mongo_duration.observe(tally.seconds, route)
+
+    def observe_command(self, collection: str, command: str, seconds: float, failed: bool) -> None:
+        self.commands.inc(collection, command, "failure" if failed else "success")
+        self.command_duration.observe(seconds, collection, command)
+        tally = _current_request.get()
+        if tally is not None:
+            tally.commands += 1
+            tally.seconds += seconds
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Connection pool totals across servers, for /health."""
+        return {
+            "open": self.pool_open.total(),
+            "in_use": self.pool_in_use.total(),
+            "waiting": self.pool_waiting.total(),
+        }
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (
+            self.requests, self.request_duration, self.request_commands,
+            self.request_mongo_duration, self.commands, self.command_duration,
+            self.pool_checkout_wait, self.pool_checkout_failures,
+            self.pool_in_use, self.pool_open, self.pool_waiting,
+        ):
+            lines.extend(metric.render())
+
+        # Group samples by metric so HELP/TYPE appear once per name
+        samples: Dict[str, Tuple[str, str, List[str]]] = {}
+        for fields, label, value, stats in self._stats:
+            current = stats()
+            for field, (name, kind, help) in fields.items():
+                if field not in current:
+                    continue
+                labels = f'{{{label}="{_escape(value)}"}}' if label else ""
+                entry = samples.setdefault(name, (kind, help, []))
+                entry[2].append(f"{name}{labels} {_number(current[field])}")
+        for name, (kind, help, values) in samples.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(values)
+
+        return "\n".join(lines) + "\n"
+
+
+class MongoCommandMonitor(monitoring.CommandListener):
+    """Feeds command durations into Metrics, per collection and per request."""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        target = event.command.get(event.command_name)
+        if isinstance(target, str):
+            return target
+        # getMore names its collection separately; aggregate: 1 runs on the db
+        return event.command.get("collection", "") if event.command_name == "getMore" else ""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._collections[(event.connection_id, event.request_id)] = self._collection(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        self.metrics.observe_command(collection, event.command_name, event.duration_micros / 1e6, failed)
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """Feeds connection pool checkouts and sizes into Metrics."""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        # A checkout starts and ends on the thread running the operation
+        self._local = threading.local()
+        self._aliases: Dict[Tuple[str, int], str] = {}
+
+    def _address(self, event) -> str:
+        """
+        Stable alias for the server's host:port, so /metrics does not reveal
+        internal hostnames but series keep their identity across restarts.
+        """
+        alias = self._aliases.get(event.address)
+        if alias is None:
+            host, port = event.address
+            digest = hashlib.sha256(f"{host}:{port}".encode()).hexdigest()[:8]
+            alias = self._aliases[event.address] = f"mongo-{digest}"
+        return alias
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        self._local.started = time.perf_counter()
+        self.metrics.pool_waiting.inc(self._address(event))
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        address = self._address(event)
+        self.metrics.pool_waiting.dec(address)
+        self.metrics.pool_in_use.inc(address)
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            self.metrics.pool_checkout_wait.observe(time.perf_counter() - started, address)
+            self._local.started = None
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        address = self._address(event)
+        self.metrics.pool_waiting.dec(address)
+        self.metrics.pool_checkout_failures.inc(address, str(event.reason))
+        self._local.started = None
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        self.metrics.pool_in_use.dec(self._address(event))
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        self.metrics.pool_open.inc(self._address(event))
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        self.metrics.pool_open.dec(self._address(event))
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and records it under its route template."""
+
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tally = RequestTally()
+        token = _current_request.set(tally)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_request.reset(token)
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.metrics.observe_request(scope["method"], route, status, elapsed, tally)
@@ -24,6 +24,22 @@ class Status(str, Enum):
     ARCHIVED = "archived"
 
 
+# Sort rank for product status (live first); used for list ordering
+STATUS_RANK = {
+    Status.LIVE.value: 0,
+    Status.BETA.value: 1,
+    Status.PILOT.value: 2,
+    Status.IDEA.value: 3,
+    Status.DEPRECATED.value: 4,
+    Status.ARCHIVED.value: 5,
+}
+
+
+def status_rank(status: str) -> int:
+    """Rank stored as products.status_rank so MongoDB can sort by it."""
+    return STATUS_RANK.get(status, len(STATUS_RANK))
+
+
 class LabStatus(str, Enum):
     HYPOTHESIS = "hypothesis"
     RUNNING = "running"
@@ -68,11 +84,26 @@ class ProductLinks(BaseModel):
     external: Optional[str] = None
 
 
-class Product(ContentBase):
+# Server-rendered MDX (?render=html)
+class RenderedHeading(BaseModel):
+    level: int
+    text: str
+    id: str = Field(..., description="Anchor id set on the rendered heading")
+
+
+class RenderedContent(BaseModel):
+    html: str
+    headings: List[RenderedHeading]
+    word_count: int
+    reading_time_minutes: int
+
+
+# List pages render everything but the MDX body, so each content type is
+# split into a summary (the default list projection) and the full model
+class ProductSummary(ContentBase):
     name: str = Field(..., min_length=1, max_length=100)
     tagline: str = Field(..., max_length=150)
     short_description: str = Field(..., max_length=300)
-    long_description: str = Field(..., description="MDX content")
     category: str
     status: Status
     accent_color: str = Field(..., pattern="^#[0-9A-Fa-f]{6}$")
@@ -84,11 +115,23 @@ class Product(ContentBase):
     theme: Optional[ProductTheme] = None
 
 
+class Product(ProductSummary):
+    long_description: str = Field(..., description="MDX content")
+
+
+class ProductDetail(Product):
+    related: Optional[List[ProductSummary]] = Field(
+        None, description="related_products resolved to summaries (?expand=related)"
+    )
+    rendered: Optional[RenderedContent] = Field(
+        None, description="long_description rendered to HTML (?render=html)"
+    )
+
+
 # Service model
-class Service(ContentBase):
+class ServiceSummary(ContentBase):
     name: str = Field(..., min_length=1, max_length=100)
     summary: str = Field(..., max_length=300)
-    description: str = Field(..., description="MDX content")
     scope: List[str]
     engagement_type: EngagementType
     deliverables: Optional[List[str]] = None
@@ -96,6 +139,19 @@ class Service(ContentBase):
     related_services: Optional[List[str]] = Field(None, description="Array of service IDs")
 
 
+class Service(ServiceSummary):
+    description: str = Field(..., description="MDX content")
+
+
+class ServiceDetail(Service):
+    related: Optional[List[ServiceSummary]] = Field(
+        None, description="related_services resolved to summaries (?expand=related)"
+    )
+    rendered: Optional[RenderedContent] = Field(
+        None, description="description rendered to HTML (?render=html)"
+    )
+
+
 # Lab model
 class LabMetric(BaseModel):
     name: str
@@ -103,9 +159,8 @@ class LabMetric(BaseModel):
     actual: Optional[str] = None
 
 
-class Lab(ContentBase):
+class LabSummary(ContentBase):
     name: str = Field(..., min_length=1, max_length=100)
-    description: str = Field(..., description="MDX content")
     hypothesis: Optional[str] = Field(None, description="What are you testing?")
     status: LabStatus
     start_date: Optional[datetime] = None
@@ -115,6 +170,16 @@ class Lab(ContentBase):
     metrics: Optional[List[LabMetric]] = None
 
 
+class Lab(LabSummary):
+    description: str = Field(..., description="MDX content")
+
+
+class LabDetail(Lab):
+    rendered: Optional[RenderedContent] = Field(
+        None, description="description rendered to HTML (?render=html)"
+    )
+
+
 # Page model
 class PageSEO(BaseModel):
     title: Optional[str] = None
@@ -128,6 +193,12 @@ class Page(ContentBase):
     seo: Optional[PageSEO] = None
 
 
+class PageDetail(Page):
+    rendered: Optional[RenderedContent] = Field(
+        None, description="content rendered to HTML (?render=html)"
+    )
+
+
 # Client Access model
 class ClientAccessScope(BaseModel):
     products: List[str] = Field(default_factory=list, description="Product IDs user can access")
@@ -180,14 +251,51 @@ class UserSession(BaseModel):
 # Response models for API
 class ProductListResponse(BaseModel):
     products: List[Product]
-    total: int
+    total: int = Field(..., description="Items matching the filters, across all pages")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page")
 
 
 class ServiceListResponse(BaseModel):
     services: List[Service]
-    total: int
+    total: int = Field(..., description="Items matching the filters, across all pages")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page")
 
 
 class LabListResponse(BaseModel):
     labs: List[Lab]
-    total: int
+    total: int = Field(..., description="Items matching the filters, across all pages")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page")
+
+
+class SearchHit(BaseModel):
+    type: str = Field(..., description="products, services, labs or pages")
+    id: str
+    slug: str
+    title: str
+    excerpt: Optional[str] = None
+    score: float = Field(..., description="BM25 relevance, higher is better")
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    total: int = Field(..., description="Documents matching every query term")
+
+
+# Default list projection (?fields=summary): no MDX bodies
+class ProductSummaryListResponse(BaseModel):
+    products: List[ProductSummary]
+    total: int = Field(..., description="Items matching the filters, across all pages")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page")
+
+
+class ServiceSummaryListResponse(BaseModel):
+    services: List[ServiceSummary]
+    total: int = Field(..., description="Items matching the filters, across all pages")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page")
+
+
+class LabSummaryListResponse(BaseModel):
+    labs: List[LabSummary]
+    total: int = Field(..., description="Items matching the filters, across all pages")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page")
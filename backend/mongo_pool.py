@@ -0,0 +1,65 @@
+"""
+MongoDB client settings and connection pool warmup.
+
+Pool sizing, timeouts, wire compression and read preference come from the
+environment; anything unset keeps the driver (or connection string)
+default. Motor runs every operation on its own thread pool, sized by
+MOTOR_MAX_WORKERS (default 5 per CPU) and read when motor is imported, so
+it should be at least MONGO_MAX_POOL_SIZE or requests queue in front of
+the pool instead of in it.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Environment variable -> MongoClient option
+INT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_CONNECTING": "maxConnecting",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+}
+STR_OPTIONS = {
+    # e.g. "zstd,zlib"; the server picks the first it also supports
+    "MONGO_COMPRESSORS": "compressors",
+    # primary, primaryPreferred, secondary, secondaryPreferred, nearest
+    "MONGO_READ_PREFERENCE": "readPreference",
+}
+
+
+def client_options() -> Dict[str, Any]:
+    """Keyword arguments for AsyncIOMotorClient from the environment."""
+    options: Dict[str, Any] = {}
+    for env, option in INT_OPTIONS.items():
+        value = os.environ.get(env)
+        if value:
+            options[option] = int(value)
+    for env, option in STR_OPTIONS.items():
+        value = os.environ.get(env)
+        if value:
+            options[option] = value
+    return options
+
+
+async def warm_pool(db, connections: int) -> None:
+    """
+    Open up to `connections` pooled connections before traffic arrives by
+    running that many pings at once; minPoolSize alone fills the pool from
+    a background thread some time after startup.
+    """
+    if connections <= 0:
+        return
+    started = time.perf_counter()
+    await asyncio.gather(*(db.command("ping") for _ in range(connections)))
+    logger.info(
+        "Warmed MongoDB pool with %s concurrent pings in %.0f ms",
+        connections, (time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,105 @@
+"""
+Compiled redirect matching.
+
+Redirect documents ({"from", "to", "permanent"}) are compiled into an
+exact-match dict plus a segment trie for wildcard rules such as
+`/old/*`, so resolving a path costs O(path length) instead of a scan
+over every rule.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Trie node key holding the rule that ends at that node
+_RULE = "\0"
+
+
+def normalize_path(path: str) -> str:
+    """Leading slash, no trailing slash (except the root)."""
+    path = "/" + path.strip().lstrip("/")
+    return path.rstrip("/") or "/"
+
+
+def _segments(path: str) -> List[str]:
+    return [s for s in path.split("/") if s]
+
+
+class RedirectMatcher:
+    """
+    Exact rules win over wildcard rules; among wildcard rules the longest
+    prefix wins. A wildcard rule `/old/*` matches `/old` and everything
+    below it, and a `to` ending in `/*` receives the matched remainder
+    (`/old/* -> /new/*` sends `/old/a/b` to `/new/a/b`).
+    """
+
+    def __init__(self, redirects: Iterable[dict]):
+        self.exact: Dict[str, Tuple[str, bool]] = {}
+        self.prefix: Dict[str, Tuple[str, bool]] = {}
+        self._trie: Dict[str, Any] = {}
+
+        for redirect in redirects:
+            source = redirect.get("from")
+            target = redirect.get("to")
+            if not source or not target:
+                continue
+            rule = (target, bool(redirect.get("permanent", True)))
+
+            if source.endswith("/*"):
+                prefix = normalize_path(source[:-2])
+                self.prefix[prefix] = rule
+                node = self._trie
+                for segment in _segments(prefix):
+                    node = node.setdefault(segment, {})
+                node[_RULE] = (prefix, rule)
+            else:
+                self.exact[normalize_path(source)] = rule
+
+    def resolve(self, path: str) -> Optional[dict]:
+        """Redirect for a request path, or None."""
+        path = normalize_path(path)
+
+        rule = self.exact.get(path)
+        if rule:
+            return {"from": path, "to": rule[0], "permanent": rule[1]}
+
+        segments = _segments(path)
+        node = self._trie
+        best = node.get(_RULE)
+        best_depth = 0
+        for depth, segment in enumerate(segments, start=1):
+            node = node.get(segment)
+            if node is None:
+                break
+            if _RULE in node:
+                best, best_depth = node[_RULE], depth
+
+        if best is None:
+            return None
+
+        prefix, (target, permanent) = best
+        if target.endswith("/*"):
+            remainder = "/".join(segments[best_depth:])
+            base = target[:-2].rstrip("/")
+            target = f"{base}/{remainder}" if remainder else (base or "/")
+        return {"from": prefix + ("/*" if prefix != "/" else "*"), "to": target, "permanent": permanent}
+
+    def compiled(self) -> dict:
+        """Compact form for edge caches: {path: [to, permanent]} per rule kind."""
+        return {
+            "exact": {k: [to, permanent] for k, (to, permanent) in self.exact.items()},
+            "prefix": {k: [to, permanent] for k, (to, permanent) in self.prefix.items()},
+        }
+
+
+class RedirectIndex:
+    """Recompiles the matcher whenever the store's redirects change."""
+
+    def __init__(self, store):
+        self.store = store
+        self._version = -1
+        self._matcher = RedirectMatcher([])
+
+    def matcher(self) -> RedirectMatcher:
+        version = self.store.versions["redirects"]
+        if version != self._version:
+            self._matcher = RedirectMatcher(self.store.redirects(limit=None))
+            self._version = version
+        return self._matcher
@@ -0,0 +1,183 @@
+"""
+Server-side rendering of the MDX content fields.
+
+Product.long_description, Service.description, Lab.description and
+Page.content hold Markdown that the frontend otherwise compiles on every
+render. RenderCache renders each distinct source text once, keyed by its
+content hash, into HTML plus a heading outline and reading time. Rendering
+runs in a process pool whenever the ContentStore changes, so endpoints can
+serve the result (?render=html) with a dict lookup.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional
+
+from markdown_it import MarkdownIt
+
+logger = logging.getLogger(__name__)
+
+# Markdown field of each content collection
+MDX_FIELDS = {
+    "products": "long_description",
+    "services": "description",
+    "labs": "description",
+    "pages": "content",
+}
+
+WORDS_PER_MINUTE = 200
+
+_WORD = re.compile(r"\w+")
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+
+# One parser per process; MarkdownIt instances are not cheap to build
+_markdown: Optional[MarkdownIt] = None
+
+
+def content_hash(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _parser() -> MarkdownIt:
+    global _markdown
+    if _markdown is None:
+        # CommonMark with raw HTML disabled, like the frontend's ReactMarkdown
+        _markdown = MarkdownIt("commonmark", {"html": False})
+    return _markdown
+
+
+def _anchor(text: str, used: Dict[str, int]) -> str:
+    base = _NON_SLUG.sub("-", text.lower()).strip("-") or "section"
+    count = used.get(base, 0)
+    used[base] = count + 1
+    return base if count == 0 else f"{base}-{count}"
+
+
+def render_markdown(source: str) -> dict:
+    """
+    Render Markdown to {"html", "headings", "word_count", "reading_time_minutes"}.
+    Headings get id attributes so the outline can link to them. Runs in
+    worker processes, so it only depends on this module.
+    """
+    md = _parser()
+    tokens = md.parse(source)
+
+    headings: List[dict] = []
+    used: Dict[str, int] = {}
+    words = 0
+    for i, token in enumerate(tokens):
+        if token.type == "inline":
+            words += sum(
+                len(_WORD.findall(child.content))
+                for child in token.children or []
+                if child.type in ("text", "code_inline")
+            )
+        elif token.type == "heading_open":
+            inline = tokens[i + 1]
+            text = "".join(
+                child.content for child in inline.children or []
+                if child.type in ("text", "code_inline")
+            )
+            anchor = _anchor(text, used)
+            token.attrSet("id", anchor)
+            headings.append({"level": int(token.tag[1]), "text": text, "id": anchor})
+
+    return {
+        "html": md.renderer.render(tokens, md.options, {}),
+        "headings": headings,
+        "word_count": words,
+        "reading_time_minutes": max(1, math.ceil(words / WORDS_PER_MINUTE)),
+    }
+
+
+class RenderCache:
+    """
+    Rendered Markdown keyed by content hash, kept in step with a ContentStore.
+
+    Entries whose source no longer appears in the store are dropped on each
+    sync. With workers=0 rendering runs in a thread instead of a process pool.
+    """
+
+    def __init__(self, store, workers: int = 2):
+        self.store = store
+        self.workers = workers
+        self.renders = 0
+        self._rendered: Dict[str, dict] = {}
+        self._version = -1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def render(self, source: str) -> dict:
+        """Rendered form of source, rendering it now on a miss."""
+        key = content_hash(source)
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            rendered = self._rendered[key] = await self._render(source)
+        return rendered
+
+    async def sync(self) -> int:
+        """Render every new source in the store; returns how many were rendered."""
+        version = self.store.version
+        if version == self._version:
+            return 0
+
+        sources = {content_hash(s): s for s in self._sources()}
+        missing = [s for key, s in sources.items() if key not in self._rendered]
+        results = await asyncio.gather(*(self._render(s) for s in missing))
+
+        rendered = {key: r for key, r in self._rendered.items() if key in sources}
+        for source, result in zip(missing, results):
+            rendered[content_hash(source)] = result
+        self._rendered = rendered
+        self._version = version
+        return len(missing)
+
+    async def run(self, interval: float = 1) -> None:
+        """Sync after every store change until cancelled."""
+        while True:
+            try:
+                count = await self.sync()
+                if count:
+                    logger.info("Rendered %s content documents", count)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Content rendering failed")
+            await asyncio.sleep(interval)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._rendered), "renders": self.renders, "workers": self.workers}
+
+    def _sources(self) -> Iterator[str]:
+        for collection, field in MDX_FIELDS.items():
+            for item in self.store.list(collection):
+                source = getattr(item, field, None)
+                if source:
+                    yield source
+
+    async def _render(self, source: str) -> dict:
+        self.renders += 1
+        if self.workers <= 0:
+            return await asyncio.to_thread(render_markdown, source)
+        if self._executor is None:
+            # spawn: forking a process that already runs Motor's threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, render_markdown, source)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next render
+            self.close()
+            raise
@@ -0,0 +1,109 @@
+"""
+Cache of serialized response bodies for the content endpoints.
+
+Content models are validated once when ContentStore loads them; this layer
+makes sure they are also serialized once per content version instead of
+being re-validated against response_model and JSON-encoded on every request.
+Bodies are keyed by their ETag, which already encodes the endpoint, the
+normalized query parameters and the content version. Compressed forms of a
+body (see compression.py) are stored next to it and evicted with it.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+
+def _encode_default(value: Any) -> Any:
+    """orjson fallback for values it has no native encoding for."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    return jsonable_encoder(value)
+
+
+def json_bytes(payload: Any) -> bytes:
+    """
+    Serialize without re-validation: models through pydantic-core's
+    model_dump_json, anything else (dicts of model dumps, raw documents)
+    through orjson, which encodes datetimes and enums natively.
+    """
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json(by_alias=True).encode("utf-8")
+    return orjson.dumps(payload, default=_encode_default)
+
+
+class ResponseCache:
+    """Bounded LRU of serialized JSON bodies keyed by ETag."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._encoded: Dict[str, Dict[str, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.encodes = 0
+
+    def get_or_build(self, etag: str, build: Callable[[], Any]) -> bytes:
+        """Return cached bytes for etag, serializing build() on a miss."""
+        body = self._bodies.get(etag)
+        if body is not None:
+            self._bodies.move_to_end(etag)
+            self.hits += 1
+            return body
+
+        self.misses += 1
+        body = json_bytes(build())
+        if self.max_entries > 0:
+            self._bodies[etag] = body
+            while len(self._bodies) > self.max_entries:
+                evicted, _ = self._bodies.popitem(last=False)
+                self._encoded.pop(evicted, None)
+        return body
+
+    def encoded(
+        self,
+        etag: str,
+        body: bytes,
+        encoding: str,
+        encode: Callable[[bytes, str], bytes],
+    ) -> Optional[bytes]:
+        """
+        body in a content encoding, encoded once and kept with the cached
+        body. None if body is not the one cached under etag.
+        """
+        if self._bodies.get(etag) is not body:
+            return None
+        variants = self._encoded.setdefault(etag, {})
+        data = variants.get(encoding)
+        if data is None:
+            data = variants[encoding] = encode(body, encoding)
+            self.encodes += 1
+        return data
+
+    def clear(self) -> None:
+        self._bodies.clear()
+        self._encoded.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._bodies),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "encoded_variants": sum(len(v) for v in self._encoded.values()),
+            "encodes": self.encodes,
+        }
+
+
+def cached_json_response(body: bytes, etag: str, cache_control: str) -> Response:
+    """Raw JSON response carrying the caching headers."""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
@@ -0,0 +1,202 @@
+"""
+In-memory full-text search over the content snapshot.
+
+SearchIndex keeps an inverted index (term -> {document: weighted term
+frequency}) over products, services, labs and pages and ranks matches with
+BM25. Every query term also matches indexed terms it is a prefix of, found
+by bisecting the sorted vocabulary, so "anal" finds "analytics". The index
+follows the ContentStore: when a collection's version changes only the
+documents whose fingerprint changed are re-indexed.
+"""
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Text fields indexed per collection, with their term-frequency weight
+SEARCH_FIELDS: Dict[str, List[Tuple[str, float]]] = {
+    "products": [
+        ("name", 3.0), ("tagline", 2.0), ("short_description", 2.0),
+        ("category", 1.5), ("features", 1.5), ("long_description", 1.0),
+    ],
+    "services": [
+        ("name", 3.0), ("summary", 2.0), ("scope", 1.5),
+        ("deliverables", 1.5), ("description", 1.0),
+    ],
+    "labs": [
+        ("name", 3.0), ("hypothesis", 2.0), ("description", 1.0),
+    ],
+    "pages": [
+        ("title", 3.0), ("content", 1.0),
+    ],
+}
+
+# Field shown as a hit's title and excerpt
+TITLE_FIELDS = {"products": "name", "services": "name", "labs": "name", "pages": "title"}
+EXCERPT_FIELDS = {"products": "tagline", "services": "summary", "labs": "hypothesis", "pages": None}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Score multiplier for a term matched only as a prefix, and the most
+# vocabulary terms one query term may expand to
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+
+_TOKEN = re.compile(r"\w+")
+
+DocKey = Tuple[str, Any]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+class SearchIndex:
+    """BM25 inverted index over the ContentStore, updated per changed document."""
+
+    def __init__(self, store):
+        self.store = store
+        self._versions: Dict[str, int] = {c: -1 for c in SEARCH_FIELDS}
+        self._fingerprints: Dict[DocKey, str] = {}
+        self._docs: Dict[DocKey, Any] = {}
+        self._terms_by_doc: Dict[DocKey, Dict[str, float]] = {}
+        self._lengths: Dict[DocKey, float] = {}
+        self._total_length = 0.0
+        self._postings: Dict[str, Dict[DocKey, float]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_stale = False
+
+    def sync(self) -> int:
+        """Re-index documents changed since the last sync; returns how many."""
+        changed = 0
+        for collection in SEARCH_FIELDS:
+            version = self.store.versions[collection]
+            if version == self._versions[collection]:
+                continue
+
+            seen = set()
+            for key, fingerprint, item in self.store.entries(collection):
+                doc = (collection, key)
+                seen.add(doc)
+                if self._fingerprints.get(doc) != fingerprint:
+                    self._remove(doc)
+                    self._add(doc, fingerprint, item)
+                    changed += 1
+            for doc in [d for d in self._docs if d[0] == collection and d not in seen]:
+                self._remove(doc)
+                changed += 1
+
+            self._versions[collection] = version
+        return changed
+
+    def search(
+        self,
+        query: str,
+        collections: Iterable[str],
+        limit: int = 20,
+        allow: Optional[Callable[[str, Any], bool]] = None,
+    ) -> Tuple[List[Tuple[float, str, Any]], int]:
+        """
+        Rank documents matching every query term (exactly or by prefix).
+        Returns ([(score, collection, item)] best first, total matches).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+
+        collections = set(collections)
+        doc_count = len(self._docs) or 1
+        avg_length = self._total_length / doc_count or 1.0
+
+        scores: Optional[Dict[DocKey, float]] = None
+        for term in terms:
+            term_scores: Dict[DocKey, float] = {}
+            for match, weight in self._expand(term):
+                postings = self._postings[match]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf in postings.items():
+                    if doc[0] not in collections:
+                        continue
+                    norm = K1 * (1 - B + B * self._lengths[doc] / avg_length)
+                    score = weight * idf * tf * (K1 + 1) / (tf + norm)
+                    # A document scores once per query term, by its best expansion
+                    if score > term_scores.get(doc, 0.0):
+                        term_scores[doc] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return [], 0
+
+        hits = [
+            (score, doc[0], self._docs[doc])
+            for doc, score in scores.items()
+            if allow is None or allow(doc[0], self._docs[doc])
+        ]
+        hits.sort(key=lambda h: (-h[0], h[1], h[2].slug))
+        return hits[:limit], len(hits)
+
+    def stats(self) -> Dict[str, int]:
+        return {"documents": len(self._docs), "terms": len(self._postings)}
+
+    # ------------------------------------------------------------------
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """The term itself plus vocabulary terms it prefixes."""
+        if self._vocabulary_stale:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_stale = False
+
+        matches = []
+        start = bisect_left(self._vocabulary, term)
+        for candidate in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+            if not candidate.startswith(term):
+                break
+            matches.append((candidate, 1.0 if candidate == term else PREFIX_WEIGHT))
+        return matches
+
+    def _add(self, doc: DocKey, fingerprint: str, item: Any) -> None:
+        frequencies: Dict[str, float] = {}
+        for field, weight in SEARCH_FIELDS[doc[0]]:
+            for token in tokenize(_field_text(getattr(item, field, None))):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+
+        for term, tf in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary_stale = True
+            postings[doc] = tf
+
+        length = sum(frequencies.values())
+        self._docs[doc] = item
+        self._fingerprints[doc] = fingerprint
+        self._terms_by_doc[doc] = frequencies
+        self._lengths[doc] = length
+        self._total_length += length
+
+    def _remove(self, doc: DocKey) -> None:
+        frequencies = self._terms_by_doc.pop(doc, None)
+        if frequencies is None:
+            return
+
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[doc]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_stale = True
+
+        self._total_length -= self._lengths.pop(doc)
+        del self._docs[doc]
+        del self._fingerprints[doc]
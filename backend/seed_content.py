@@ -11,6 +11,10 @@ import os
 from datetime import datetime, timezone
 import uuid
 
+from content_store import bump_content_version
+from indexes import ensure_indexes as reconcile_indexes
+from models import STATUS_RANK, status_rank
+
 # ---------------------------------------------------------------------------
 # Environment loading (local only – Fly.io secrets override automatically)
 # ---------------------------------------------------------------------------
@@ -35,18 +39,27 @@ if PYTHON_ENV == "production":
 async def ensure_indexes(db):
     print("🔧 Ensuring indexes...")
 
-    await db.products.create_index("slug", unique=True)
-    await db.services.create_index("slug", unique=True)
-    await db.labs.create_index("slug", unique=True)
-    await db.pages.create_index("slug", unique=True)
+    # Same declarations the API reconciles at startup
+    problems = await reconcile_indexes(db)
+    if problems:
+        print("⚠️ Indexes not reconciled:", ", ".join(problems))
 
-    await db.products.create_index("visibility")
-    await db.services.create_index("visibility")
-    await db.labs.create_index("visibility")
+    print("✅ Indexes ready")
 
-    await db.redirects.create_index("from", unique=True)
+# ---------------------------------------------------------------------------
+# Derived fields
+# ---------------------------------------------------------------------------
 
-    print("✅ Indexes ready")
+async def backfill_status_rank(db):
+    """Set products.status_rank wherever it is missing or out of date."""
+    updated = 0
+    for status, rank in STATUS_RANK.items():
+        result = await db.products.update_many(
+            {"status": status, "status_rank": {"$ne": rank}},
+            {"$set": {"status_rank": rank}},
+        )
+        updated += result.modified_count
+    print(f"✅ Backfilled status_rank on {updated} products")
 
 # ---------------------------------------------------------------------------
 # Seed logic
@@ -175,8 +188,12 @@ async def seed_database():
         },
     ]
 
+    for product in products:
+        product["status_rank"] = status_rank(product["status"])
+
     await db.products.insert_many(products)
     print(f"✅ Inserted {len(products)} products")
+    await backfill_status_rank(db)
 
     # -----------------------------------------------------------------------
     # SERVICES
@@ -261,6 +278,8 @@ async def seed_database():
     await db.redirects.insert_many(redirects)
     print(f"✅ Inserted {len(redirects)} redirects")
 
+    await bump_content_version(db, now)
+
     print("\n🎉 Database seeded successfully")
     print("📁 Collections:", await db.list_collection_names())
     print("📂 Databases AFTER seed:", await client.list_database_names())
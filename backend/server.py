@@ -1,12 +1,16 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Header, Cookie, Response, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
+import asyncio
+import hmac
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Tuple
 import uuid
 from datetime import datetime, timezone, timedelta
 
@@ -14,12 +18,35 @@ from datetime import datetime, timezone, timedelta
 from models import (
     Product, Service, Lab, Page, Redirect, ClientAccess,
     User, UserSession, Role, Visibility, Status, LabStatus,
-    ProductListResponse, ServiceListResponse, LabListResponse
+    ProductListResponse, ServiceListResponse, LabListResponse,
+    ProductDetail, ServiceDetail, LabDetail, PageDetail, SearchHit, SearchResponse,
+    ProductSummaryListResponse, ServiceSummaryListResponse, LabSummaryListResponse
 )
 
 # Import Firebase configuration
 from firebase_config import initialize_firebase, verify_firebase_token
 
+from session_cache import SessionCache
+from access import AccessScope, ANONYMOUS
+from sessions import session_lookup_pipeline, normalize_session_expiry, run_session_sweeper
+from indexes import ensure_indexes
+from content_store import ContentStore, encode_cursor, decode_cursor
+from content_watcher import ContentWatcher
+from http_cache import (
+    PUBLIC_CACHE_CONTROL, PRIVATE_CACHE_CONTROL, REDIRECTS_CACHE_CONTROL,
+    make_etag, not_modified,
+)
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, Metrics, MetricsMiddleware,
+    MongoCommandMonitor, MongoPoolMonitor,
+)
+from mongo_pool import client_options, warm_pool
+from compression import CompressionMiddleware, CompressionStats
+from response_cache import ResponseCache, cached_json_response, json_bytes
+from redirects import RedirectIndex
+from rendered_content import RenderCache
+from search_index import SearchIndex, SEARCH_FIELDS, TITLE_FIELDS, EXCERPT_FIELDS
+
 
 ROOT_DIR = Path(__file__).parent
 if os.getenv("PYTHON_ENV") != "production":
@@ -32,17 +59,94 @@ db_name = os.getenv("DB_NAME")
 if not mongo_url or not db_name:
     raise RuntimeError("❌ MONGO_URL and DB_NAME must be set")
 
-client = AsyncIOMotorClient(mongo_url)
+# Request, MongoDB command and cache metrics, served at /metrics
+metrics = Metrics()
+
+# Pool size, timeouts, compression and read preference from MONGO_* env vars
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[MongoCommandMonitor(metrics), MongoPoolMonitor(metrics)],
+    **client_options(),
+)
 db = client[db_name]
 
+# In-memory content snapshot (public read path never hits MongoDB),
+# kept in sync by change streams or, on standalone servers, by polling
+content_store = ContentStore(
+    db,
+    max_age=float(os.environ.get("CONTENT_MAX_AGE_SECONDS", "300")),
+)
+content_watcher = ContentWatcher(
+    db,
+    content_store,
+    poll_interval=float(os.environ.get("CONTENT_POLL_SECONDS", "15")),
+)
+
+# Redirect rules compiled for O(path length) lookups
+redirect_index = RedirectIndex(content_store)
+
+# MDX fields rendered to HTML once per content hash, in worker processes
+render_cache = RenderCache(
+    content_store,
+    workers=int(os.environ.get("MDX_RENDER_WORKERS", "2")),
+)
+
+# BM25 full-text index over the snapshot, re-indexed per changed document
+search_index = SearchIndex(content_store)
+
+# Serialized content bodies, keyed by ETag (endpoint + params + content version)
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+)
+
+# gzip/brotli bytes-saved counters; compressed cached bodies live in response_cache
+compression_stats = CompressionStats(
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+)
+
+# Long-running tasks started at startup, cancelled at shutdown
+background_tasks: List[asyncio.Task] = []
+
 # Create the main app without a prefix
-app = FastAPI(title="Relvanta Platform API")
+# Endpoints that return models are serialized by pydantic-core (response_model)
+# and written with orjson; content endpoints send pre-serialized bytes
+app = FastAPI(title="Relvanta Platform API", default_response_class=ORJSONResponse)
 
-# Initialize Firebase Admin SDK
+# Initialize Firebase Admin SDK, reconcile indexes and load content
 @app.on_event("startup")
 async def startup():
     initialize_firebase()
 
+    try:
+        await ensure_indexes(db)
+    except Exception:
+        logging.getLogger(__name__).exception("Index reconciliation failed")
+
+    try:
+        await normalize_session_expiry(db)
+    except Exception:
+        logging.getLogger(__name__).exception("Session expiry normalization failed")
+
+    try:
+        # Open connections before traffic instead of on the first burst
+        await warm_pool(db, int(os.environ.get("MONGO_MIN_POOL_SIZE", "0")))
+    except Exception:
+        logging.getLogger(__name__).exception("MongoDB pool warmup failed")
+
+    try:
+        await content_store.load()
+    except Exception:
+        # Endpoints retry via ensure_loaded(); don't block startup on Mongo
+        logging.getLogger(__name__).exception("Initial content load failed")
+
+    background_tasks.append(asyncio.create_task(content_watcher.run()))
+    background_tasks.append(asyncio.create_task(render_cache.run()))
+    background_tasks.append(asyncio.create_task(run_session_sweeper(
+        db,
+        session_cache,
+        interval=float(os.environ.get("SESSION_SWEEP_SECONDS", "300")),
+    )))
+
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
@@ -69,72 +173,93 @@ COOKIE_SECURE = os.environ.get("COOKIE_SECURE", "true").strip().lower() in (
 COOKIE_SAMESITE = os.environ.get("COOKIE_SAMESITE", "lax").strip().lower()
 
 
+# ============================================================================
+# SESSION CACHE
+# ============================================================================
+
+# Resolved sessions are cached in-process so warm requests skip MongoDB.
+# The TTL bounds how stale a cached user/role can get across API instances.
+session_cache = SessionCache(
+    max_size=int(os.environ.get("SESSION_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=float(os.environ.get("SESSION_CACHE_TTL_SECONDS", "60")),
+)
+
+
 # ============================================================================
 # AUTHENTICATION UTILITIES
 # ============================================================================
 
-async def get_current_user(
+async def get_current_session(
     authorization: Optional[str] = Header(None),
     session_token: Optional[str] = Cookie(None)
-) -> Optional[User]:
+) -> Optional[Tuple[User, AccessScope]]:
     """
-    Authenticator helper - checks session_token from cookies first, 
-    then Authorization header as fallback.
+    Resolve the caller's session to (user, access scope) - checks
+    session_token from cookies first, then Authorization header as fallback.
     """
     token = session_token or (authorization.replace("Bearer ", "") if authorization else None)
     
     if not token:
         return None
     
-    # Find session in database
-    session_doc = await db.user_sessions.find_one(
-        {"session_token": token},
-        {"_id": 0}  # Exclude MongoDB's _id
-    )
-    
-    if not session_doc:
-        return None
+    cached = session_cache.get(token)
+    if cached:
+        return cached
     
-    # Check expiry (handle timezone-aware comparison)
-    expires_at = session_doc["expires_at"]
-    if isinstance(expires_at, str):
-        expires_at = datetime.fromisoformat(expires_at)
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    # Resolve session, user and client access in a single round trip
+    results = await db.user_sessions.aggregate(
+        session_lookup_pipeline(token, datetime.now(timezone.utc))
+    ).to_list(length=1)
     
-    if expires_at < datetime.now(timezone.utc):
-        # Session expired
-        await db.user_sessions.delete_one({"session_token": token})
+    if not results:
         return None
     
-    # Get user
-    user_doc = await db.users.find_one(
-        {"user_id": session_doc["user_id"]},
-        {"_id": 0}  # Exclude MongoDB's _id
-    )
-    
-    if not user_doc:
-        return None
+    # Expired sessions never match; the TTL index and sweeper delete them
+    session_doc = results[0]
     
-    return User(**user_doc)
+    user = User(**session_doc["user"])
+    access_docs = session_doc.get("access") or []
+    scope = AccessScope.for_user(user, access_docs[0] if access_docs else None)
+    # BSON dates come back naive (UTC)
+    expires_at = session_doc["expires_at"].replace(tzinfo=timezone.utc)
+    session_cache.set(token, user, scope, expires_at)
+    return user, scope
 
 
-async def require_auth(
+async def get_current_user(
     authorization: Optional[str] = Header(None),
     session_token: Optional[str] = Cookie(None)
-) -> User:
-    """Require authentication, raise 401 if not authenticated."""
-    user = await get_current_user(authorization, session_token)
-    if not user:
+) -> Optional[User]:
+    """Authenticator helper - the caller's user, or None."""
+    session = await get_current_session(authorization, session_token)
+    return session[0] if session else None
+
+
+async def get_access_scope(
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+) -> AccessScope:
+    """What the caller may see; anonymous callers only see public content."""
+    session = await get_current_session(authorization, session_token)
+    return session[1] if session else ANONYMOUS
+
+
+async def require_session(
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+) -> Tuple[User, AccessScope]:
+    """The caller's user and access scope; raise 401 if not authenticated."""
+    session = await get_current_session(authorization, session_token)
+    if not session:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    return user
+    return session
 
 
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
 # ============================================================================
 
-@api_router.post("/auth/session")
+@api_router.post("/auth/session", response_model=User)
 async def create_session(
     response: Response,
     request: Request
@@ -154,7 +279,7 @@ async def create_session(
     firebase_token = auth_header.replace("Bearer ", "")
     
     # Verify Firebase token
-    decoded_token = verify_firebase_token(firebase_token)
+    decoded_token = await verify_firebase_token(firebase_token)
     
     if not decoded_token:
         raise HTTPException(status_code=401, detail="Invalid or expired Firebase token")
@@ -168,50 +293,66 @@ async def create_session(
     if not firebase_uid or not email:
         raise HTTPException(status_code=400, detail="Invalid token claims")
     
-    # Check if user exists
-    existing_user = await db.users.find_one(
-        {"email": email},
-        {"_id": 0}
-    )
-    
-    if existing_user:
-        # Update existing user
-        user_id = existing_user["user_id"]
-        await db.users.update_one(
-            {"user_id": user_id},
-            {"$set": {
-                "name": name,
-                "picture": picture,
-                "firebase_uid": firebase_uid,  # Store Firebase UID
-                "updated_at": datetime.now(timezone.utc)
-            }}
-        )
-    else:
-        # Create new user with custom user_id (not MongoDB _id)
-        user_id = f"user_{uuid.uuid4().hex[:12]}"
-        await db.users.insert_one({
-            "user_id": user_id,
-            "firebase_uid": firebase_uid,  # Store Firebase UID
-            "email": email,
+    # Update the user, or create it with a custom user_id (not MongoDB _id),
+    # and get the resulting document back in one round trip
+    now = datetime.now(timezone.utc)
+    user_update = {
+        "$set": {
             "name": name,
             "picture": picture,
+            "firebase_uid": firebase_uid,  # Store Firebase UID
+            "updated_at": now
+        },
+        "$setOnInsert": {
+            "user_id": f"user_{uuid.uuid4().hex[:12]}",
+            "email": email,
             "role": Role.CLIENT.value,  # Default role
             "organization_slug": None,
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        })
+            "created_at": now
+        }
+    }
+    try:
+        user_doc = await db.users.find_one_and_update(
+            {"email": email},
+            user_update,
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # A concurrent first login for this email inserted the user first
+        user_doc = await db.users.find_one_and_update(
+            {"email": email},
+            user_update,
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    
+    user = User(**user_doc)
+    
+    # Profile fields may have changed - drop any cached sessions for this user
+    session_cache.invalidate_user(user.user_id)
     
-    # Create session with timezone-aware expiry (7 days)
+    # Create session with timezone-aware expiry (7 days). It needs the
+    # resolved user_id, so it follows the upsert; the client_access read that
+    # primes the session's access scope runs alongside it.
     session_token = f"sess_{uuid.uuid4().hex}"
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+    expires_at = now + timedelta(days=7)
     
-    await db.user_sessions.insert_one({
-        "user_id": user_id,
-        "session_token": session_token,
-        "firebase_uid": firebase_uid,  # Link to Firebase user
-        "expires_at": expires_at,
-        "created_at": datetime.now(timezone.utc)
-    })
+    _, access_doc = await asyncio.gather(
+        db.user_sessions.insert_one({
+            "user_id": user.user_id,
+            "session_token": session_token,
+            "firebase_uid": firebase_uid,  # Link to Firebase user
+            "expires_at": expires_at,
+            "created_at": now
+        }),
+        db.client_access.find_one({"user_id": user.user_id}, {"_id": 0}),
+    )
+    
+    # The next authenticated request is served from the cache
+    session_cache.set(session_token, user, AccessScope.for_user(user, access_doc), expires_at)
     
     # Set httpOnly cookie
     response.set_cookie(
@@ -225,12 +366,10 @@ async def create_session(
         max_age=7 * 24 * 60 * 60  # 7 days in seconds
     )
     
-    # Return user data
-    user_doc = await db.users.find_one({"user_id": user_id}, {"_id": 0})
-    return User(**user_doc)
+    return user
 
 
-@api_router.get("/auth/me")
+@api_router.get("/auth/me", response_model=User)
 async def get_current_user_endpoint(
     authorization: Optional[str] = Header(None),
     session_token: Optional[str] = Cookie(None)
@@ -255,7 +394,8 @@ async def logout(
     token = session_token or (authorization.replace("Bearer ", "") if authorization else None)
     
     if token:
-        # Delete session from database
+        # Delete session from cache and database
+        session_cache.invalidate(token)
         await db.user_sessions.delete_one({"session_token": token})
     
     # Clear cookie
@@ -274,177 +414,630 @@ async def logout(
 # CONTENT ENDPOINTS - PRODUCTS
 # ============================================================================
 
-@api_router.get("/content/products", response_model=ProductListResponse)
+def content_cache_control(visibility: Optional[str]) -> str:
+    """Shared caches may only hold public listings."""
+    if visibility and visibility != Visibility.PUBLIC.value:
+        return PRIVATE_CACHE_CONTROL
+    return PUBLIC_CACHE_CONTROL
+
+
+async def listing_scope(
+    collection: str,
+    visibility: Optional[str],
+    authorization: Optional[str],
+    session_token: Optional[str]
+) -> Tuple[Optional[FrozenSet[str]], Optional[str]]:
+    """
+    (ids the caller may list, scope key for the ETag) for a visibility
+    filter. Public listings need no session lookup and no id filter.
+    """
+    if not visibility or visibility == Visibility.PUBLIC.value:
+        return None, None
+    scope = await get_access_scope(authorization, session_token)
+    return scope.visible_ids(collection), scope.key
+
+
+async def require_visible(
+    collection: str,
+    item,
+    not_found: str,
+    authorization: Optional[str],
+    session_token: Optional[str]
+) -> None:
+    """404 (not 403, to avoid revealing the slug) for items outside the caller's scope."""
+    if item.visibility == Visibility.PUBLIC:
+        return
+    scope = await get_access_scope(authorization, session_token)
+    if not scope.allows(collection, item):
+        raise HTTPException(status_code=404, detail=not_found)
+
+
+def parse_cursor(cursor: Optional[str], collection: str) -> Optional[tuple]:
+    """Decode a ?cursor= value, rejecting tampered or foreign cursors."""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, collection)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ?fields= presets; anything else is a comma-separated list of model fields
+SUMMARY_FIELDS = "summary"
+FULL_FIELDS = "full"
+
+
+def parse_fields(fields: Optional[str], model) -> str:
+    """
+    Normalize ?fields= to "summary" (the default), "full", or a sorted
+    comma-joined field list that always includes id and slug.
+    """
+    if not fields or fields == SUMMARY_FIELDS:
+        return SUMMARY_FIELDS
+    if fields == FULL_FIELDS:
+        return FULL_FIELDS
+    names = {f.strip() for f in fields.split(",") if f.strip()} | {"id", "slug"}
+    unknown = names - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return ",".join(sorted(names))
+
+
+def list_payload(key: str, items: list, total: int, next_key, fieldset: str, summary_model, full_model):
+    """
+    List body for a fieldset. Full models are subclasses of their summaries,
+    so the summary response serializes the stored items without copying them.
+    """
+    next_cursor = encode_cursor(next_key) if next_key else None
+    if fieldset == SUMMARY_FIELDS:
+        return summary_model(**{key: items}, total=total, next_cursor=next_cursor)
+    if fieldset == FULL_FIELDS:
+        return full_model(**{key: items}, total=total, next_cursor=next_cursor)
+    include = set(fieldset.split(","))
+    return {
+        key: [item.model_dump(include=include) for item in items],
+        "total": total,
+        "next_cursor": next_cursor,
+    }
+
+
+# Upper bound on slugs/ids per batch request
+MAX_BATCH_SIZE = 100
+
+
+def parse_batch_keys(slugs: Optional[str], ids: Optional[str]) -> Tuple[str, List[str]]:
+    """Split ?slugs=a,b or ?ids=x,y into (field, keys), de-duplicated in order."""
+    if bool(slugs) == bool(ids):
+        raise HTTPException(status_code=400, detail="Pass either slugs or ids")
+    keys = list(dict.fromkeys(k.strip() for k in (slugs or ids).split(",") if k.strip()))
+    if not keys:
+        raise HTTPException(status_code=400, detail="No slugs or ids given")
+    if len(keys) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_SIZE} items per batch"
+        )
+    return ("slug" if slugs else "id"), keys
+
+
+def batch_items(collection: str, field: str, keys: List[str]) -> list:
+    """Items in request order; unknown slugs/ids are skipped."""
+    lookup = content_store.get if field == "slug" else content_store.get_by_id
+    items = (lookup(collection, key) for key in keys)
+    return [item for item in items if item is not None]
+
+
+async def scoped_batch(
+    collection: str,
+    items: list,
+    authorization: Optional[str],
+    session_token: Optional[str]
+) -> Tuple[list, Optional[str]]:
+    """Drop batch items outside the caller's scope; also returns the scope key."""
+    if all(item.visibility == Visibility.PUBLIC for item in items):
+        return items, None
+    scope = await get_access_scope(authorization, session_token)
+    return [item for item in items if scope.allows(collection, item)], scope.key
+
+
+def batch_cache_control(items: list) -> str:
+    if any(item.visibility != Visibility.PUBLIC for item in items):
+        return PRIVATE_CACHE_CONTROL
+    return PUBLIC_CACHE_CONTROL
+
+
+def parse_expand(expand: Optional[str]) -> bool:
+    """?expand=related is the only supported expansion."""
+    if expand and expand != "related":
+        raise HTTPException(status_code=400, detail="Unsupported expand")
+    return expand == "related"
+
+
+def parse_render(render: Optional[str]) -> bool:
+    """?render=html adds the server-rendered MDX body as `rendered`."""
+    if render and render != "html":
+        raise HTTPException(status_code=400, detail="Unsupported render")
+    return render == "html"
+
+
+def related_summaries(collection: str, ids: Optional[List[str]]) -> list:
+    """
+    Resolve related_* ids to public items, keeping their order. The Detail
+    models declare them as summaries, so only summary fields are serialized.
+    """
+    items = (content_store.get_by_id(collection, item_id) for item_id in ids or [])
+    return [item for item in items if item is not None and item.visibility == Visibility.PUBLIC]
+
+
+@api_router.get("/content/products", response_model=ProductSummaryListResponse)
 async def list_products(
+    request: Request,
     visibility: Optional[str] = None,
     status: Optional[str] = None,
     category: Optional[str] = None,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
 ):
     """
     List products with optional filters.
-    Public endpoint - returns only public products unless authenticated.
+    Public endpoint - returns only public products unless authenticated;
+    other visibilities list only the products in the caller's scope.
+    Sorted by order, then status, then name; page with ?cursor=next_cursor.
+    Items are summaries (no long_description) unless ?fields=full or
+    ?fields=name,status,... asks for something else.
     """
-    query = {}
-    
-    if visibility:
-        query["visibility"] = visibility
-    else:
-        # Default to public only
-        query["visibility"] = Visibility.PUBLIC.value
-    
-    if status:
-        query["status"] = status
-    
-    if category:
-        query["category"] = category
+    after = parse_cursor(cursor, "products")
+    fieldset = parse_fields(fields, Product)
+    visible, scope_key = await listing_scope("products", visibility, authorization, session_token)
+    await content_store.ensure_loaded()
     
-    # Query database
-    products_cursor = db.products.find(query, {"_id": 0}).limit(limit)
-    products_list = await products_cursor.to_list(length=limit)
+    cache_control = content_cache_control(visibility)
+    etag = make_etag(
+        "products", visibility, status, category, limit, cursor, fieldset, scope_key,
+        content_store.digest("products"),
+    )
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
     
-    # Sort by order, then status, then name
-    def sort_key(p):
-        status_order = {"live": 0, "beta": 1, "pilot": 2, "idea": 3, "deprecated": 4, "archived": 5}
-        return (
-            p.get("order", 999),
-            status_order.get(p.get("status", "idea"), 999),
-            p.get("name", "")
+    def build():
+        # Default to public only
+        products_list, total, next_key = content_store.page(
+            "products",
+            limit,
+            after,
+            ids=visible,
+            visibility=visibility or Visibility.PUBLIC.value,
+            status=status,
+            category=category,
+        )
+        return list_payload(
+            "products", products_list, total, next_key, fieldset,
+            ProductSummaryListResponse, ProductListResponse,
         )
     
-    products_list.sort(key=sort_key)
+    body = response_cache.get_or_build(etag, build)
+    return cached_json_response(body, etag, cache_control)
+
+
+@api_router.get("/content/products:batch", response_model=ProductListResponse)
+async def batch_products(
+    request: Request,
+    slugs: Optional[str] = None,
+    ids: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+):
+    """
+    Fetch several products in one call: ?slugs=a,b,c or ?ids=x,y.
+    Results follow the requested order; unknown slugs/ids and items
+    outside the caller's scope are omitted.
+    """
+    field, keys = parse_batch_keys(slugs, ids)
+    await content_store.ensure_loaded()
+    products_list, scope_key = await scoped_batch(
+        "products", batch_items("products", field, keys), authorization, session_token,
+    )
     
-    return ProductListResponse(
-        products=[Product(**p) for p in products_list],
-        total=len(products_list)
+    cache_control = batch_cache_control(products_list)
+    etag = make_etag(
+        "products-batch", field, ",".join(keys), scope_key, content_store.digest("products"),
     )
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    
+    body = response_cache.get_or_build(
+        etag,
+        lambda: ProductListResponse(products=products_list, total=len(products_list)),
+    )
+    return cached_json_response(body, etag, cache_control)
 
 
-@api_router.get("/content/products/{slug}", response_model=Product)
-async def get_product(slug: str):
-    """Get a single product by slug."""
-    product_doc = await db.products.find_one(
-        {"slug": slug},
-        {"_id": 0}
-    )
+@api_router.get("/content/products/{slug}", response_model=ProductDetail)
+async def get_product(
+    slug: str,
+    request: Request,
+    expand: Optional[str] = None,
+    render: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+):
+    """
+    Get a single product by slug (non-public ones only within the caller's scope).
+    ?expand=related inlines summaries of related_products as `related`;
+    ?render=html adds long_description rendered to HTML as `rendered`.
+    """
+    expand_related = parse_expand(expand)
+    render_html = parse_render(render)
+    await content_store.ensure_loaded()
+    product = content_store.get("products", slug)
     
-    if not product_doc:
+    if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    await require_visible("products", product, "Product not found", authorization, session_token)
+    
+    cache_control = content_cache_control(product.visibility.value)
+    etag_parts = ["product", content_store.fingerprint("products", slug)]
+    if expand_related:
+        # Related summaries change with any product, not just this one
+        etag_parts += ["related", content_store.digest("products")]
+    if render_html:
+        etag_parts.append("html")
+    etag = make_etag(*etag_parts)
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    
+    rendered = await render_cache.render(product.long_description) if render_html else None
     
-    return Product(**product_doc)
+    def build():
+        if not (expand_related or render_html):
+            return product
+        return ProductDetail(
+            **dict(product),
+            related=related_summaries("products", product.related_products) if expand_related else None,
+            rendered=rendered,
+        )
+    
+    body = response_cache.get_or_build(etag, build)
+    return cached_json_response(body, etag, cache_control)
 
 
 # ============================================================================
 # CONTENT ENDPOINTS - SERVICES
 # ============================================================================
 
-@api_router.get("/content/services", response_model=ServiceListResponse)
+@api_router.get("/content/services", response_model=ServiceSummaryListResponse)
 async def list_services(
+    request: Request,
     visibility: Optional[str] = None,
     engagement_type: Optional[str] = None,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
 ):
-    """List services with optional filters."""
-    query = {}
+    """
+    List services with optional filters, sorted by order then name.
+    Non-public visibilities list only the services in the caller's scope.
+    Items are summaries (no description) unless ?fields= says otherwise.
+    """
+    after = parse_cursor(cursor, "services")
+    fieldset = parse_fields(fields, Service)
+    visible, scope_key = await listing_scope("services", visibility, authorization, session_token)
+    await content_store.ensure_loaded()
     
-    if visibility:
-        query["visibility"] = visibility
-    else:
-        query["visibility"] = Visibility.PUBLIC.value
+    cache_control = content_cache_control(visibility)
+    etag = make_etag(
+        "services", visibility, engagement_type, limit, cursor, fieldset, scope_key,
+        content_store.digest("services"),
+    )
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
     
-    if engagement_type:
-        query["engagement_type"] = engagement_type
+    def build():
+        services_list, total, next_key = content_store.page(
+            "services",
+            limit,
+            after,
+            ids=visible,
+            visibility=visibility or Visibility.PUBLIC.value,
+            engagement_type=engagement_type,
+        )
+        return list_payload(
+            "services", services_list, total, next_key, fieldset,
+            ServiceSummaryListResponse, ServiceListResponse,
+        )
     
-    services_cursor = db.services.find(query, {"_id": 0}).limit(limit)
-    services_list = await services_cursor.to_list(length=limit)
+    body = response_cache.get_or_build(etag, build)
+    return cached_json_response(body, etag, cache_control)
+
+
+@api_router.get("/content/services:batch", response_model=ServiceListResponse)
+async def batch_services(
+    request: Request,
+    slugs: Optional[str] = None,
+    ids: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+):
+    """
+    Fetch several services in one call: ?slugs=a,b,c or ?ids=x,y.
+    Results follow the requested order; unknown slugs/ids and items
+    outside the caller's scope are omitted.
+    """
+    field, keys = parse_batch_keys(slugs, ids)
+    await content_store.ensure_loaded()
+    services_list, scope_key = await scoped_batch(
+        "services", batch_items("services", field, keys), authorization, session_token,
+    )
     
-    return ServiceListResponse(
-        services=[Service(**s) for s in services_list],
-        total=len(services_list)
+    cache_control = batch_cache_control(services_list)
+    etag = make_etag(
+        "services-batch", field, ",".join(keys), scope_key, content_store.digest("services"),
     )
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    
+    body = response_cache.get_or_build(
+        etag,
+        lambda: ServiceListResponse(services=services_list, total=len(services_list)),
+    )
+    return cached_json_response(body, etag, cache_control)
 
 
-@api_router.get("/content/services/{slug}", response_model=Service)
-async def get_service(slug: str):
-    """Get a single service by slug."""
-    service_doc = await db.services.find_one(
-        {"slug": slug},
-        {"_id": 0}
-    )
+@api_router.get("/content/services/{slug}", response_model=ServiceDetail)
+async def get_service(
+    slug: str,
+    request: Request,
+    expand: Optional[str] = None,
+    render: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+):
+    """
+    Get a single service by slug (non-public ones only within the caller's scope).
+    ?expand=related inlines summaries of related_services as `related`;
+    ?render=html adds description rendered to HTML as `rendered`.
+    """
+    expand_related = parse_expand(expand)
+    render_html = parse_render(render)
+    await content_store.ensure_loaded()
+    service = content_store.get("services", slug)
     
-    if not service_doc:
+    if not service:
         raise HTTPException(status_code=404, detail="Service not found")
+    await require_visible("services", service, "Service not found", authorization, session_token)
+    
+    cache_control = content_cache_control(service.visibility.value)
+    etag_parts = ["service", content_store.fingerprint("services", slug)]
+    if expand_related:
+        etag_parts += ["related", content_store.digest("services")]
+    if render_html:
+        etag_parts.append("html")
+    etag = make_etag(*etag_parts)
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    
+    rendered = await render_cache.render(service.description) if render_html else None
     
-    return Service(**service_doc)
+    def build():
+        if not (expand_related or render_html):
+            return service
+        return ServiceDetail(
+            **dict(service),
+            related=related_summaries("services", service.related_services) if expand_related else None,
+            rendered=rendered,
+        )
+    
+    body = response_cache.get_or_build(etag, build)
+    return cached_json_response(body, etag, cache_control)
 
 
 # ============================================================================
 # CONTENT ENDPOINTS - LABS (Protected)
 # ============================================================================
 
-@api_router.get("/content/labs", response_model=LabListResponse)
+@api_router.get("/content/labs", response_model=LabSummaryListResponse)
 async def list_labs(
+    request: Request,
     status: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     authorization: Optional[str] = Header(None),
     session_token: Optional[str] = Cookie(None)
 ):
     """
     List labs (requires authentication).
-    Labs are experimental content requiring explicit access.
+    Labs are experimental content requiring explicit access: admins see
+    every lab, everyone else the labs listed in their ClientAccess scope.
+    Items are summaries (no description) unless ?fields= says otherwise.
     """
-    user = await require_auth(authorization, session_token)
+    user, scope = await require_session(authorization, session_token)
     
-    query = {"visibility": Visibility.LABS.value}
+    after = parse_cursor(cursor, "labs")
+    fieldset = parse_fields(fields, Lab)
+    await content_store.ensure_loaded()
     
-    if status:
-        query["status"] = status
+    etag = make_etag(
+        "labs", status, limit, cursor, fieldset, scope.key, content_store.digest("labs"),
+    )
+    cached = not_modified(request, etag, PRIVATE_CACHE_CONTROL)
+    if cached:
+        return cached
     
-    labs_cursor = db.labs.find(query, {"_id": 0}).limit(limit)
-    labs_list = await labs_cursor.to_list(length=limit)
+    def build():
+        labs_list, total, next_key = content_store.page(
+            "labs",
+            limit,
+            after,
+            ids=scope.visible_ids("labs"),
+            visibility=Visibility.LABS.value,
+            status=status,
+        )
+        return list_payload(
+            "labs", labs_list, total, next_key, fieldset,
+            LabSummaryListResponse, LabListResponse,
+        )
     
-    return LabListResponse(
-        labs=[Lab(**l) for l in labs_list],
-        total=len(labs_list)
-    )
+    body = response_cache.get_or_build(etag, build)
+    return cached_json_response(body, etag, PRIVATE_CACHE_CONTROL)
 
 
-@api_router.get("/content/labs/{slug}", response_model=Lab)
+@api_router.get("/content/labs/{slug}", response_model=LabDetail)
 async def get_lab(
     slug: str,
+    request: Request,
+    render: Optional[str] = None,
     authorization: Optional[str] = Header(None),
     session_token: Optional[str] = Cookie(None)
 ):
-    """Get a single lab by slug (requires authentication)."""
-    user = await require_auth(authorization, session_token)
+    """
+    Get a single lab by slug (requires authentication and access to the lab).
+    ?render=html adds description rendered to HTML as `rendered`.
+    """
+    user, scope = await require_session(authorization, session_token)
     
-    lab_doc = await db.labs.find_one(
-        {"slug": slug},
-        {"_id": 0}
-    )
+    render_html = parse_render(render)
+    await content_store.ensure_loaded()
+    lab = content_store.get("labs", slug)
     
-    if not lab_doc:
+    if not lab or not scope.allows("labs", lab):
         raise HTTPException(status_code=404, detail="Lab not found")
     
-    return Lab(**lab_doc)
+    etag = make_etag(
+        "lab", content_store.fingerprint("labs", slug), "html" if render_html else None,
+    )
+    cached = not_modified(request, etag, PRIVATE_CACHE_CONTROL)
+    if cached:
+        return cached
+    
+    if render_html:
+        rendered = await render_cache.render(lab.description)
+        body = response_cache.get_or_build(etag, lambda: LabDetail(**dict(lab), rendered=rendered))
+    else:
+        body = response_cache.get_or_build(etag, lambda: lab)
+    return cached_json_response(body, etag, PRIVATE_CACHE_CONTROL)
 
 
 # ============================================================================
 # CONTENT ENDPOINTS - PAGES
 # ============================================================================
 
-@api_router.get("/content/pages/{slug}", response_model=Page)
-async def get_page(slug: str):
-    """Get a single page by slug."""
-    page_doc = await db.pages.find_one(
-        {"slug": slug},
-        {"_id": 0}
-    )
+@api_router.get("/content/pages/{slug}", response_model=PageDetail)
+async def get_page(
+    slug: str,
+    request: Request,
+    render: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+):
+    """
+    Get a single page by slug (non-public pages are admin-only).
+    ?render=html adds content rendered to HTML as `rendered`.
+    """
+    render_html = parse_render(render)
+    await content_store.ensure_loaded()
+    page = content_store.get("pages", slug)
     
-    if not page_doc:
+    if not page:
         raise HTTPException(status_code=404, detail="Page not found")
+    await require_visible("pages", page, "Page not found", authorization, session_token)
+    
+    cache_control = content_cache_control(page.visibility.value)
+    etag = make_etag(
+        "page", content_store.fingerprint("pages", slug), "html" if render_html else None,
+    )
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
     
-    return Page(**page_doc)
+    if render_html:
+        rendered = await render_cache.render(page.content)
+        body = response_cache.get_or_build(etag, lambda: PageDetail(**dict(page), rendered=rendered))
+    else:
+        body = response_cache.get_or_build(etag, lambda: page)
+    return cached_json_response(body, etag, cache_control)
+
+
+# ============================================================================
+# CONTENT ENDPOINTS - SEARCH
+# ============================================================================
+
+MAX_SEARCH_RESULTS = 100
+
+
+@api_router.get("/content/search", response_model=SearchResponse)
+async def search_content(
+    request: Request,
+    q: str,
+    types: Optional[str] = None,
+    limit: int = 20,
+    authorization: Optional[str] = Header(None),
+    session_token: Optional[str] = Cookie(None)
+):
+    """
+    Full-text search over public products, services and pages, plus the
+    non-public items and labs in the caller's scope. Every word must match,
+    either exactly or as a prefix; results are ranked by BM25. Narrow with
+    ?types=products,services.
+    """
+    if types:
+        collections = [t.strip() for t in types.split(",") if t.strip()]
+        unknown = set(collections) - set(SEARCH_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown types: {', '.join(sorted(unknown))}"
+            )
+    else:
+        collections = list(SEARCH_FIELDS)
+    limit = min(max(limit, 1), MAX_SEARCH_RESULTS)
+    
+    scope = await get_access_scope(authorization, session_token)
+    if scope is ANONYMOUS:
+        collections = [c for c in collections if c != "labs"]
+    
+    await content_store.ensure_loaded()
+    search_index.sync()
+    
+    cache_control = PUBLIC_CACHE_CONTROL if scope is ANONYMOUS else PRIVATE_CACHE_CONTROL
+    etag = make_etag(
+        "search", q, ",".join(sorted(collections)), limit, scope.key,
+        *(content_store.digest(c) for c in sorted(collections)),
+    )
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    
+    # Not kept in response_cache: q is caller-controlled, so cached search
+    # bodies could evict the content bodies shared by everyone
+    hits, total = search_index.search(q, collections, limit, scope.allows)
+    response = SearchResponse(
+        query=q,
+        results=[
+            SearchHit(
+                type=collection,
+                id=item.id,
+                slug=item.slug,
+                title=getattr(item, TITLE_FIELDS[collection]),
+                excerpt=getattr(item, EXCERPT_FIELDS[collection]) if EXCERPT_FIELDS[collection] else None,
+                score=round(score, 4),
+            )
+            for score, collection, item in hits
+        ],
+        total=total,
+    )
+    return cached_json_response(json_bytes(response), etag, cache_control)
 
 
 # ============================================================================
@@ -452,34 +1045,88 @@ async def get_page(slug: str):
 # ============================================================================
 
 @api_router.get("/content/redirects")
-async def list_redirects():
+async def list_redirects(request: Request):
     """Get all redirects for client-side or middleware use."""
-    redirects_cursor = db.redirects.find({}, {"_id": 0})
-    redirects_list = await redirects_cursor.to_list(length=1000)
-    return {"redirects": redirects_list}
+    await content_store.ensure_loaded()
+    
+    etag = make_etag("redirects", content_store.digest("redirects"))
+    cached = not_modified(request, etag, REDIRECTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    
+    body = response_cache.get_or_build(
+        etag, lambda: {"redirects": content_store.redirects(limit=1000)}
+    )
+    return cached_json_response(body, etag, REDIRECTS_CACHE_CONTROL)
+
+
+@api_router.get("/content/redirects/compiled")
+async def get_compiled_redirects(request: Request):
+    """
+    Redirects compiled into exact and wildcard-prefix maps, for edge caches.
+    `version` changes whenever any redirect does.
+    """
+    await content_store.ensure_loaded()
+    
+    version = content_store.digest("redirects")
+    etag = make_etag("redirects-compiled", version)
+    cached = not_modified(request, etag, REDIRECTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    
+    body = response_cache.get_or_build(
+        etag, lambda: {"version": version, **redirect_index.matcher().compiled()}
+    )
+    return cached_json_response(body, etag, REDIRECTS_CACHE_CONTROL)
+
+
+@api_router.get("/content/redirects/resolve")
+async def resolve_redirect(path: str, request: Request):
+    """Resolve one path against exact and wildcard (`/old/*`) redirects."""
+    await content_store.ensure_loaded()
+    
+    etag = make_etag("redirect", path, content_store.digest("redirects"))
+    cached = not_modified(request, etag, REDIRECTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    
+    redirect = redirect_index.matcher().resolve(path)
+    if not redirect:
+        raise HTTPException(status_code=404, detail="No redirect for path")
+    
+    return cached_json_response(json_bytes(redirect), etag, REDIRECTS_CACHE_CONTROL)
 
 
 # ============================================================================
 # CLIENT ACCESS (For future use)
 # ============================================================================
 
-@api_router.get("/access/{user_id}")
+@api_router.get("/access/{user_id}", response_model=ClientAccess)
 async def get_client_access(
     user_id: str,
     authorization: Optional[str] = Header(None),
     session_token: Optional[str] = Cookie(None)
 ):
-    """Get client access permissions."""
-    user = await require_auth(authorization, session_token)
+    """
+    Get client access permissions. A user's own access is served from the
+    session cache; admins looking up other users read MongoDB.
+    """
+    user, scope = await require_session(authorization, session_token)
     
     # Users can only access their own permissions (unless admin)
     if user.user_id != user_id and user.role != Role.ADMIN:
         raise HTTPException(status_code=403, detail="Forbidden")
     
-    access_doc = await db.client_access.find_one(
-        {"user_id": user_id},
-        {"_id": 0}
-    )
+    if user.user_id == user_id:
+        # Loaded with the session and cached alongside it
+        if scope.access:
+            return scope.access
+        access_doc = None
+    else:
+        access_doc = await db.client_access.find_one(
+            {"user_id": user_id},
+            {"_id": 0}
+        )
     
     if not access_doc:
         # Return default empty access
@@ -517,6 +1164,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies, reusing the stored variant of cached content bodies
+app.add_middleware(CompressionMiddleware, stats=compression_stats, cache=response_cache)
+
+# Outermost, so request latency includes compression
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+metrics.register_cache("session", session_cache.stats)
+metrics.register_cache("response", response_cache.stats)
+metrics.register_compression(compression_stats.stats)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -527,10 +1183,39 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
+    render_cache.close()
     client.close()
 
 
 # Health check
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "relvanta-api"}
+    return {
+        "status": "healthy",
+        "service": "relvanta-api",
+        "session_cache": session_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "render_cache": render_cache.stats(),
+        "search_index": search_index.stats(),
+        "compression": compression_stats.stats(),
+        "mongo_pool": metrics.pool_stats(),
+    }
+
+
+# Prometheus scrape endpoint. Off unless METRICS_TOKEN is set; scrapers send
+# it as a bearer token, since the metrics describe traffic and MongoDB load.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN") or None
+
+
+@app.get("/metrics")
+async def metrics_endpoint(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = authorization.replace("Bearer ", "") if authorization else ""
+    if not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,97 @@
+"""
+In-process cache of resolved sessions.
+Lets get_current_user answer warm sessions without touching MongoDB, and
+keeps each session's precomputed AccessScope alongside the user.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from access import AccessScope
+from models import User
+
+
+class SessionCache:
+    """
+    Bounded LRU cache mapping session_token -> (User, AccessScope, session
+    expires_at).
+
+    Entries live until the earlier of the session's own expires_at and the
+    cache TTL. The TTL bounds how long a role or ClientAccess change, or a
+    logout performed on another API instance, can go unnoticed by this
+    process.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[User, AccessScope, datetime, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[Tuple[User, AccessScope]]:
+        """Return the cached (user, scope) for a token, or None on miss/expiry."""
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        user, scope, expires_at, cached_until = entry
+        if time.monotonic() >= cached_until or expires_at <= datetime.now(timezone.utc):
+            del self._entries[token]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return user, scope
+
+    def set(self, token: str, user: User, scope: AccessScope, expires_at: datetime) -> None:
+        """Cache a resolved session. expires_at must be timezone-aware."""
+        if self.max_size <= 0:
+            return
+
+        self._entries[token] = (user, scope, expires_at, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(token)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        """Drop a single session (logout, expired session deleted)."""
+        self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached session belonging to a user (profile changed)."""
+        stale = [t for t, (user, _, _, _) in self._entries.items() if user.user_id == user_id]
+        for token in stale:
+            del self._entries[token]
+
+    def prune_expired(self) -> None:
+        """Drop entries whose session or cache lifetime has ended."""
+        now_mono = time.monotonic()
+        now = datetime.now(timezone.utc)
+        stale = [
+            t for t, (_, _, expires_at, cached_until) in self._entries.items()
+            if now_mono >= cached_until or expires_at <= now
+        ]
+        for token in stale:
+            del self._entries[token]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,84 @@
+"""
+Session queries and housekeeping.
+
+Sessions store expires_at as a BSON date. MongoDB's TTL index on
+user_sessions.expires_at (declared in indexes.py) deletes them once
+expired, a periodic sweeper backs that up, and the request path only
+filters on expires_at > now - it never writes.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List
+
+from session_cache import SessionCache
+
+logger = logging.getLogger(__name__)
+
+
+def session_lookup_pipeline(token: str, now: datetime) -> List[dict]:
+    """
+    Aggregation returning an unexpired session joined with its user and
+    the user's client_access document (an empty array when there is none).
+    """
+    return [
+        {"$match": {"session_token": token, "expires_at": {"$gt": now}}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "user_id",
+            "as": "user",
+        }},
+        {"$unwind": "$user"},
+        {"$lookup": {
+            "from": "client_access",
+            "localField": "user_id",
+            "foreignField": "user_id",
+            "as": "access",
+        }},
+        {"$project": {"_id": 0, "expires_at": 1, "user": 1, "access": 1}},
+    ]
+
+
+async def normalize_session_expiry(db) -> int:
+    """
+    Convert legacy ISO-string expires_at values to BSON dates.
+
+    Strings are invisible to both the TTL index and the expires_at > now
+    filter. Unparseable values become "now", so they expire immediately.
+    """
+    result = await db.user_sessions.update_many(
+        {"expires_at": {"$type": "string"}},
+        [{"$set": {"expires_at": {"$dateFromString": {
+            "dateString": "$expires_at",
+            "onError": "$$NOW",
+        }}}}],
+    )
+    if result.modified_count:
+        logger.info("Normalized expires_at on %s sessions", result.modified_count)
+    return result.modified_count
+
+
+async def sweep_expired_sessions(db, cache: SessionCache) -> int:
+    """Delete expired sessions now rather than waiting for the TTL monitor."""
+    await normalize_session_expiry(db)
+    result = await db.user_sessions.delete_many(
+        {"expires_at": {"$lte": datetime.now(timezone.utc)}}
+    )
+    cache.prune_expired()
+    return result.deleted_count
+
+
+async def run_session_sweeper(db, cache: SessionCache, interval: float = 300) -> None:
+    """Background task: sweep expired sessions every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await sweep_expired_sessions(db, cache)
+            if deleted:
+                logger.info("Swept %s expired sessions", deleted)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Session sweep failed")
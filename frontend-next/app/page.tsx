@@ -1,13 +1,13 @@
 import Link from 'next/link';
 import { getProducts } from '@/lib/api';
 import { getServices } from '@/lib/api';
-import type { Product, Service } from '@/lib/schemas';
+import type { ProductSummary, ServiceSummary } from '@/lib/schemas';
 
 export const revalidate = 60;
 
 export default async function HomePage() {
-  let products: Product[] = [];
-  let services: Service[] = [];
+  let products: ProductSummary[] = [];
+  let services: ServiceSummary[] = [];
   
   try {
     const [productsRes, servicesRes] = await Promise.all([
@@ -232,7 +232,7 @@ export default async function HomePage() {
   );
 }
 
-function ServiceCard({ service, index }: { service: Service; index: number }) {
+function ServiceCard({ service, index }: { service: ServiceSummary; index: number }) {
   const icons = ['dashboard', 'notifications', 'settings', 'public'];
   return (
     <Link 
@@ -275,7 +275,7 @@ function PlaceholderServiceCard({ title, icon, status }: { title: string; icon:
   );
 }
 
-function ProductCard({ product }: { product: Product }) {
+function ProductCard({ product }: { product: ProductSummary }) {
   const colorMap: Record<string, string> = {
     '#7C3AED': 'purple',
     '#3b82f6': 'blue',
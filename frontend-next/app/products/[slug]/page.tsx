@@ -1,6 +1,6 @@
 import { notFound } from 'next/navigation';
 import { getProduct, getProducts } from '@/lib/api';
-import { Product } from '@/lib/schemas';
+import { ProductSummary } from '@/lib/schemas';
 import MDXRenderer from '@/components/content/MDXRenderer';
 import Link from 'next/link';
 
@@ -48,7 +48,7 @@ export default async function ProductDetailPage({
     notFound();
   }
 
-  let relatedProducts: Product[] = [];
+  let relatedProducts: ProductSummary[] = [];
   if (product.related_products && product.related_products.length > 0) {
     try {
       const { products: allProducts } = await getProducts({ visibility: 'public' });
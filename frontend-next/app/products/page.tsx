@@ -1,11 +1,11 @@
 import Link from 'next/link';
 import { getProducts } from '@/lib/api';
-import type { Product } from '@/lib/schemas';
+import type { ProductSummary } from '@/lib/schemas';
 
 export const revalidate = 60;
 
 export default async function ProductsPage() {
-  let products: Product[] = [];
+  let products: ProductSummary[] = [];
   try {
     const response = await getProducts({ visibility: 'public' });
     products = response.products;
@@ -78,7 +78,7 @@ export default async function ProductsPage() {
   );
 }
 
-function ProductCard({ product }: { product: Product }) {
+function ProductCard({ product }: { product: ProductSummary }) {
   return (
     <Link 
       href={`/products/${product.slug}`}
@@ -1,6 +1,6 @@
 import { notFound } from 'next/navigation';
 import { getService, getServices } from '@/lib/api';
-import { Service } from '@/lib/schemas';
+import { ServiceSummary } from '@/lib/schemas';
 import MDXRenderer from '@/components/content/MDXRenderer';
 import Link from 'next/link';
 
@@ -48,7 +48,7 @@ export default async function ServiceDetailPage({
     notFound();
   }
 
-  let relatedServices: Service[] = [];
+  let relatedServices: ServiceSummary[] = [];
   if (service.related_services && service.related_services.length > 0) {
     try {
       const { services: allServices } = await getServices({ visibility: 'public' });
@@ -1,11 +1,11 @@
 import Link from 'next/link';
 import { getServices } from '@/lib/api';
-import type { Service } from '@/lib/schemas';
+import type { ServiceSummary } from '@/lib/schemas';
 
 export const revalidate = 60;
 
 export default async function ServicesPage() {
-  let services: Service[] = [];
+  let services: ServiceSummary[] = [];
   try {
     const response = await getServices({ visibility: 'public' });
     services = response.services;
@@ -90,7 +90,7 @@ export default async function ServicesPage() {
   );
 }
 
-function ServiceCard({ service, index }: { service: Service; index: number }) {
+function ServiceCard({ service, index }: { service: ServiceSummary; index: number }) {
   const icons = ['dashboard', 'psychology', 'settings', 'support_agent', 'analytics', 'code'];
   const colors = ['primary', 'green-500', 'purple-500', 'amber-500', 'cyan-500', 'pink-500'];
   const color = colors[index % colors.length];
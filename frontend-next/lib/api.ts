@@ -3,8 +3,11 @@
  */
 import {
   Product,
+  ProductSummary,
   Service,
+  ServiceSummary,
   Lab,
+  LabSummary,
   Page,
   ProductSchema,
   ServiceSchema,
@@ -26,12 +29,16 @@ export async function getProducts(params?: {
   visibility?: string;
   status?: string;
   category?: string;
+  limit?: number;
+  cursor?: string;
   revalidate?: number;
-}): Promise<{ products: Product[]; total: number }> {
+}): Promise<{ products: ProductSummary[]; total: number; next_cursor?: string | null }> {
   const queryParams = new URLSearchParams();
   if (params?.visibility) queryParams.set('visibility', params.visibility);
   if (params?.status) queryParams.set('status', params.status);
   if (params?.category) queryParams.set('category', params.category);
+  if (params?.limit) queryParams.set('limit', String(params.limit));
+  if (params?.cursor) queryParams.set('cursor', params.cursor);
 
   const url = `${API_URL}/api/content/products${queryParams.toString() ? `?${queryParams}` : ''}`;
 
@@ -72,11 +79,15 @@ export async function getProduct(slug: string, revalidate = 60): Promise<Product
 export async function getServices(params?: {
   visibility?: string;
   engagement_type?: string;
+  limit?: number;
+  cursor?: string;
   revalidate?: number;
-}): Promise<{ services: Service[]; total: number }> {
+}): Promise<{ services: ServiceSummary[]; total: number; next_cursor?: string | null }> {
   const queryParams = new URLSearchParams();
   if (params?.visibility) queryParams.set('visibility', params.visibility);
   if (params?.engagement_type) queryParams.set('engagement_type', params.engagement_type);
+  if (params?.limit) queryParams.set('limit', String(params.limit));
+  if (params?.cursor) queryParams.set('cursor', params.cursor);
 
   const url = `${API_URL}/api/content/services${queryParams.toString() ? `?${queryParams}` : ''}`;
 
@@ -116,10 +127,14 @@ export async function getService(slug: string, revalidate = 60): Promise<Service
  */
 export async function getLabs(params?: {
   status?: string;
+  limit?: number;
+  cursor?: string;
   token?: string;
-}): Promise<{ labs: Lab[]; total: number }> {
+}): Promise<{ labs: LabSummary[]; total: number; next_cursor?: string | null }> {
   const queryParams = new URLSearchParams();
   if (params?.status) queryParams.set('status', params.status);
+  if (params?.limit) queryParams.set('limit', String(params.limit));
+  if (params?.cursor) queryParams.set('cursor', params.cursor);
 
   const url = `${API_URL}/api/content/labs${queryParams.toString() ? `?${queryParams}` : ''}`;
 
@@ -73,6 +73,10 @@ export const ProductSchema = ContentBaseSchema.extend({
 });
 export type Product = z.infer<typeof ProductSchema>;
 
+// List endpoints return summaries (everything but the MDX body) by default
+export const ProductSummarySchema = ProductSchema.omit({ long_description: true });
+export type ProductSummary = z.infer<typeof ProductSummarySchema>;
+
 // Service schema
 export const ServiceSchema = ContentBaseSchema.extend({
   name: z.string().min(1).max(100),
@@ -86,6 +90,9 @@ export const ServiceSchema = ContentBaseSchema.extend({
 });
 export type Service = z.infer<typeof ServiceSchema>;
 
+export const ServiceSummarySchema = ServiceSchema.omit({ description: true });
+export type ServiceSummary = z.infer<typeof ServiceSummarySchema>;
+
 // Lab schema
 export const LabMetricSchema = z.object({
   name: z.string(),
@@ -106,6 +113,9 @@ export const LabSchema = ContentBaseSchema.extend({
 });
 export type Lab = z.infer<typeof LabSchema>;
 
+export const LabSummarySchema = LabSchema.omit({ description: true });
+export type LabSummary = z.infer<typeof LabSummarySchema>;
+
 // Page schema
 export const PageSEOSchema = z.object({
   title: z.string().optional(),
@@ -151,16 +161,19 @@ export type User = z.infer<typeof UserSchema>;
 
 // API Response schemas
 export const ProductListResponseSchema = z.object({
-  products: z.array(ProductSchema),
+  products: z.array(ProductSummarySchema),
   total: z.number(),
+  next_cursor: z.string().nullable().optional(),
 });
 
 export const ServiceListResponseSchema = z.object({
-  services: z.array(ServiceSchema),
+  services: z.array(ServiceSummarySchema),
   total: z.number(),
+  next_cursor: z.string().nullable().optional(),
 });
 
 export const LabListResponseSchema = z.object({
-  labs: z.array(LabSchema),
+  labs: z.array(LabSummarySchema),
   total: z.number(),
+  next_cursor: z.string().nullable().optional(),
 });
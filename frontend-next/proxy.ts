@@ -3,8 +3,15 @@ import type { NextRequest } from 'next/server';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8001';
 
-// Cache redirects in memory (refresh every 5 minutes)
-let redirectsCache: { from: string; to: string; permanent: boolean }[] = [];
+// Compiled redirects from the API (refresh every 5 minutes):
+// exact rules keyed by path, wildcard rules ("/old/*") keyed by prefix
+type CompiledRedirects = {
+  version: string;
+  exact: Record<string, [string, boolean]>;
+  prefix: Record<string, [string, boolean]>;
+};
+
+let redirectsCache: CompiledRedirects | null = null;
 let lastFetch = 0;
 const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
 
@@ -12,18 +19,17 @@ async function fetchRedirects() {
   const now = Date.now();
   
   // Return cached if still fresh
-  if (redirectsCache.length > 0 && now - lastFetch < CACHE_DURATION) {
+  if (redirectsCache && now - lastFetch < CACHE_DURATION) {
     return redirectsCache;
   }
 
   try {
-    const response = await fetch(`${API_URL}/api/content/redirects`, {
+    const response = await fetch(`${API_URL}/api/content/redirects/compiled`, {
       next: { revalidate: 300 }, // 5 minutes
     });
 
     if (response.ok) {
-      const data = await response.json();
-      redirectsCache = data.redirects || [];
+      redirectsCache = await response.json();
       lastFetch = now;
     }
   } catch (error) {
@@ -33,6 +39,35 @@ async function fetchRedirects() {
   return redirectsCache;
 }
 
+// Exact match first, then the longest wildcard prefix; a target ending in
+// "/*" receives the rest of the path (mirrors backend/redirects.py; the
+// cases both must satisfy are in tests/test_redirects.py)
+function resolveRedirect(redirects: CompiledRedirects, path: string) {
+  const pathname = path.replace(/\/+$/, '') || '/';
+
+  const exact = redirects.exact[pathname];
+  if (exact) {
+    return { to: exact[0], permanent: exact[1] };
+  }
+
+  const segments = pathname.split('/').filter(Boolean);
+  for (let depth = segments.length; depth >= 0; depth--) {
+    const prefix = '/' + segments.slice(0, depth).join('/');
+    const rule = redirects.prefix[prefix];
+    if (rule) {
+      let [to] = rule;
+      if (to.endsWith('/*')) {
+        const base = to.slice(0, -2).replace(/\/+$/, '');
+        const rest = segments.slice(depth).join('/');
+        to = rest ? `${base}/${rest}` : base || '/';
+      }
+      return { to, permanent: rule[1] };
+    }
+  }
+
+  return null;
+}
+
 // Named export for Next.js 16+ proxy
 export async function proxy(request: NextRequest) {
   const pathname = request.nextUrl.pathname;
@@ -48,7 +83,7 @@ export async function proxy(request: NextRequest) {
 
   // Fetch and check redirects
   const redirects = await fetchRedirects();
-  const redirect = redirects.find((r) => r.from === pathname);
+  const redirect = redirects ? resolveRedirect(redirects, pathname) : null;
 
   if (redirect) {
     const url = request.nextUrl.clone();
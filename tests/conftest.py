@@ -0,0 +1,82 @@
+"""
+Shared fixtures. Tests run against an in-memory mongomock-motor database;
+server.py is imported once and its module-level state is rebound to a
+fresh database per test.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+# server.py reads these at import time. PYTHON_ENV=production keeps it from
+# loading backend/.env, so nothing can point the tests at a real cluster.
+os.environ["MONGO_URL"] = "mongodb://localhost:27017"
+os.environ["DB_NAME"] = "relvanta_test"
+os.environ["PYTHON_ENV"] = "production"
+os.environ["MDX_RENDER_WORKERS"] = "0"
+
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+
+from models import status_rank
+
+
+@pytest.fixture
+def make_product():
+    """Factory of valid products documents; keyword arguments override fields."""
+
+    def make(slug: str, **fields) -> dict:
+        now = datetime.now(timezone.utc)
+        doc = {
+            "id": f"id-{slug}", "slug": slug, "visibility": "public", "order": 1,
+            "created_at": now, "updated_at": now,
+            "name": slug.title(), "tagline": "t", "short_description": "s",
+            "long_description": "body", "category": "tools", "status": "live",
+            "accent_color": "#123456",
+            **fields,
+        }
+        # Maintained on write by every importer; LOAD_SORTS relies on it
+        doc.setdefault("status_rank", status_rank(doc["status"]))
+        return doc
+
+    return make
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()[os.environ["DB_NAME"]]
+
+
+@pytest.fixture
+def api(db, monkeypatch):
+    """The server module bound to `db`, with an unloaded snapshot and empty caches."""
+    import server
+
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server.content_store, "db", db)
+    monkeypatch.setattr(server.content_watcher, "db", db)
+    monkeypatch.setattr(server.content_store, "loaded_at", None)
+    # asyncio locks bind to the loop they first wait on; each test has its own
+    monkeypatch.setattr(server.content_store, "_lock", asyncio.Lock())
+    server.session_cache.clear()
+    server.response_cache.clear()
+    yield server
+    server.session_cache.clear()
+    server.response_cache.clear()
+
+
+@pytest.fixture
+async def http(api):
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,237 @@
+"""Who sees what: anonymous callers, scoped clients and admins on every read path."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from access import ANONYMOUS, AccessScope
+from models import ClientAccess
+
+pytestmark = pytest.mark.anyio
+
+CLIENT = {"Authorization": "Bearer client-token"}
+UNSCOPED = {"Authorization": "Bearer unscoped-token"}
+EXPIRED = {"Authorization": "Bearer expired-token"}
+ADMIN = {"Authorization": "Bearer admin-token"}
+
+
+def lab(id, slug, order):
+    now = datetime.now(timezone.utc)
+    return {
+        "id": id, "slug": slug, "visibility": "labs", "order": order,
+        "created_at": now, "updated_at": now,
+        "name": f"Widget lab {slug}", "description": "d", "status": "running",
+    }
+
+
+@pytest.fixture
+async def catalog(db, make_product):
+    """
+    Public product "open", protected "granted" (in the client's scope) and
+    "hidden" (in nobody's), labs "lab-granted" and "lab-hidden". The
+    unscoped client has no ClientAccess; the expired one's grant lapsed.
+    """
+    now = datetime.now(timezone.utc)
+    await db.products.insert_many([
+        make_product("open", name="Widget open", order=1),
+        make_product("granted", name="Widget granted", visibility="protected", order=2),
+        make_product("hidden", name="Widget hidden", visibility="protected", order=3),
+    ])
+    await db.labs.insert_many([lab("l-granted", "lab-granted", 1), lab("l-hidden", "lab-hidden", 2)])
+
+    for user_id, role in [("client", "client"), ("unscoped", "client"), ("expired", "client"), ("admin", "admin")]:
+        await db.users.insert_one({
+            "user_id": user_id, "email": f"{user_id}@example.com", "name": user_id,
+            "role": role, "created_at": now,
+        })
+        await db.user_sessions.insert_one({
+            "user_id": user_id, "session_token": f"{user_id}-token",
+            "expires_at": now + timedelta(days=1), "created_at": now,
+        })
+    grant = {"products": ["id-granted"], "services": [], "labs": ["l-granted"]}
+    await db.client_access.insert_many([
+        {"user_id": "client", "scope": grant, "permissions": ["read"], "granted_at": now},
+        {"user_id": "expired", "scope": grant, "permissions": ["read"], "granted_at": now,
+         "expires_at": now - timedelta(hours=1)},
+    ])
+
+
+def slugs(response, key="products"):
+    assert response.status_code == 200, response.text
+    return [item["slug"] for item in response.json()[key]]
+
+
+# ---------------------------------------------------------------------------
+# Lists
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, []),
+    (UNSCOPED, []),
+    (EXPIRED, []),
+    (CLIENT, ["granted"]),
+    (ADMIN, ["granted", "hidden"]),
+])
+async def test_protected_list_shows_only_the_callers_scope(catalog, http, headers, expected):
+    response = await http.get("/api/content/products?visibility=protected", headers=headers)
+    assert slugs(response) == expected
+
+
+@pytest.mark.parametrize("headers", [{}, CLIENT, ADMIN])
+async def test_default_list_is_public_for_everyone(catalog, http, headers):
+    response = await http.get("/api/content/products", headers=headers)
+    assert slugs(response) == ["open"]
+
+
+async def test_labs_require_a_session(catalog, http):
+    assert (await http.get("/api/content/labs")).status_code == 401
+
+
+@pytest.mark.parametrize("headers, expected", [
+    (UNSCOPED, []),
+    (EXPIRED, []),
+    (CLIENT, ["lab-granted"]),
+    (ADMIN, ["lab-granted", "lab-hidden"]),
+])
+async def test_labs_list_shows_only_the_callers_scope(catalog, http, headers, expected):
+    assert slugs(await http.get("/api/content/labs", headers=headers), "labs") == expected
+
+
+# ---------------------------------------------------------------------------
+# Details: out-of-scope items are 404, never 403
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("headers, slug, status", [
+    ({}, "open", 200),
+    ({}, "granted", 404),
+    (UNSCOPED, "granted", 404),
+    (EXPIRED, "granted", 404),
+    (CLIENT, "granted", 200),
+    (CLIENT, "hidden", 404),
+    (ADMIN, "hidden", 200),
+])
+async def test_product_detail(catalog, http, headers, slug, status):
+    response = await http.get(f"/api/content/products/{slug}", headers=headers)
+    assert response.status_code == status
+    if status == 404:
+        assert response.json() == {"detail": "Product not found"}
+
+
+async def test_out_of_scope_slug_looks_like_a_missing_one(catalog, http):
+    hidden = await http.get("/api/content/products/hidden", headers=CLIENT)
+    missing = await http.get("/api/content/products/no-such-product", headers=CLIENT)
+    assert (hidden.status_code, hidden.json()) == (missing.status_code, missing.json())
+
+
+@pytest.mark.parametrize("headers, slug, status", [
+    ({}, "lab-granted", 401),
+    (EXPIRED, "lab-granted", 404),
+    (CLIENT, "lab-granted", 200),
+    (CLIENT, "lab-hidden", 404),
+    (ADMIN, "lab-hidden", 200),
+])
+async def test_lab_detail(catalog, http, headers, slug, status):
+    response = await http.get(f"/api/content/labs/{slug}", headers=headers)
+    assert response.status_code == status
+
+
+# ---------------------------------------------------------------------------
+# Batch and search drop what the caller may not see
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, ["open"]),
+    (EXPIRED, ["open"]),
+    (CLIENT, ["open", "granted"]),
+    (ADMIN, ["open", "granted", "hidden"]),
+])
+async def test_batch(catalog, http, headers, expected):
+    response = await http.get("/api/content/products:batch?slugs=open,granted,hidden", headers=headers)
+    assert slugs(response) == expected
+    assert response.json()["total"] == len(expected)
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, {("products", "open")}),
+    (EXPIRED, {("products", "open")}),
+    (CLIENT, {("products", "open"), ("products", "granted"), ("labs", "lab-granted")}),
+    (ADMIN, {
+        ("products", "open"), ("products", "granted"), ("products", "hidden"),
+        ("labs", "lab-granted"), ("labs", "lab-hidden"),
+    }),
+])
+async def test_search(catalog, http, headers, expected):
+    response = await http.get("/api/content/search?q=widget", headers=headers)
+    assert response.status_code == 200
+    assert {(hit["type"], hit["slug"]) for hit in response.json()["results"]} == expected
+
+
+# ---------------------------------------------------------------------------
+# ETags and cached bodies never cross scopes
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("url", [
+    "/api/content/products?visibility=protected",
+    "/api/content/products:batch?slugs=open,granted,hidden",
+    "/api/content/search?q=widget",
+])
+async def test_etags_differ_between_scopes(catalog, http, url):
+    etags = {}
+    for name, headers in [("anonymous", {}), ("client", CLIENT), ("admin", ADMIN)]:
+        etags[name] = (await http.get(url, headers=headers)).headers["ETag"]
+    assert len(set(etags.values())) == 3
+
+
+async def test_another_callers_etag_is_not_revalidated(catalog, http):
+    url = "/api/content/products?visibility=protected"
+    client = await http.get(url, headers=CLIENT)
+    assert client.headers["Cache-Control"].startswith("private")
+
+    # Same URL, same If-None-Match, different scope: a full body, not a 304
+    admin = await http.get(url, headers={**ADMIN, "If-None-Match": client.headers["ETag"]})
+    assert admin.status_code == 200
+    assert slugs(admin) == ["granted", "hidden"]
+
+    unscoped = await http.get(url, headers={**UNSCOPED, "If-None-Match": client.headers["ETag"]})
+    assert unscoped.status_code == 200
+    assert slugs(unscoped) == []
+
+    again = await http.get(url, headers={**CLIENT, "If-None-Match": client.headers["ETag"]})
+    assert again.status_code == 304
+
+
+# ---------------------------------------------------------------------------
+# AccessScope
+# ---------------------------------------------------------------------------
+
+
+def access(expires_at=None, products=("id-granted",)):
+    return ClientAccess(
+        user_id="client",
+        scope={"products": list(products)},
+        permissions=["read"],
+        granted_at=datetime.now(timezone.utc),
+        expires_at=expires_at,
+    )
+
+
+def test_expired_access_grants_nothing():
+    # BSON dates come back naive; both forms must count as expired
+    for expires_at in (
+        datetime.now(timezone.utc) - timedelta(seconds=1),
+        datetime.utcnow() - timedelta(seconds=1),
+    ):
+        scope = AccessScope(access(expires_at))
+        assert scope.visible_ids("products") == frozenset()
+        assert scope.key == ANONYMOUS.key
+
+
+def test_scope_keys_identify_the_visible_set():
+    later = datetime.now(timezone.utc) + timedelta(days=1)
+    assert AccessScope(access()).key == AccessScope(access(later)).key
+    assert AccessScope(access()).key != AccessScope(access(products=("id-hidden",))).key
+    assert AccessScope(access()).key != ANONYMOUS.key
+    assert AccessScope(full_access=True).key == "all"
@@ -0,0 +1,82 @@
+"""Negotiated encodings: compressed 200s and the 304s that revalidate them."""
+import pytest
+
+from compression import negotiate
+
+pytestmark = pytest.mark.anyio
+
+URL = "/api/content/products"
+
+
+@pytest.fixture
+async def catalog(db, make_product):
+    await db.products.insert_many([make_product(f"product-{i}", order=i) for i in range(20)])
+
+
+@pytest.fixture
+def minimum_size(api, monkeypatch):
+    def set_minimum(size):
+        monkeypatch.setattr(api.compression_stats, "minimum_size", size)
+    return set_minimum
+
+
+def cache_headers(response):
+    return {name: response.headers.get(name) for name in ("ETag", "Vary", "Cache-Control")}
+
+
+@pytest.mark.parametrize("accept_encoding, size", [
+    ("gzip", 0),           # compressed
+    ("gzip", 1 << 20),     # negotiated, but too small to compress
+    ("identity", 0),
+])
+async def test_304_carries_the_headers_of_the_200(catalog, http, minimum_size, accept_encoding, size):
+    minimum_size(size)
+    first = await http.get(URL, headers={"Accept-Encoding": accept_encoding})
+    assert first.status_code == 200
+
+    again = await http.get(URL, headers={
+        "Accept-Encoding": accept_encoding, "If-None-Match": first.headers["ETag"],
+    })
+    assert again.status_code == 304
+    assert cache_headers(again) == cache_headers(first)
+    assert "Accept-Encoding" in again.headers["Vary"]
+
+
+async def test_gzip_200_is_weak_and_identity_200_is_strong(catalog, http, minimum_size):
+    minimum_size(0)
+    compressed = await http.get(URL, headers={"Accept-Encoding": "gzip"})
+    identity = await http.get(URL, headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert compressed.headers["ETag"] == "W/" + identity.headers["ETag"]
+    assert compressed.json() == identity.json()
+
+
+async def test_either_etag_revalidates_either_encoding(catalog, http, minimum_size):
+    minimum_size(0)
+    weak = (await http.get(URL, headers={"Accept-Encoding": "gzip"})).headers["ETag"]
+    strong = (await http.get(URL, headers={"Accept-Encoding": "identity"})).headers["ETag"]
+    for etag in (weak, strong):
+        for encoding in ("gzip", "identity"):
+            response = await http.get(URL, headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+            assert response.status_code == 304
+
+
+async def test_compressed_body_is_cached_per_etag(api, catalog, http, minimum_size):
+    minimum_size(0)
+    first = await http.get(URL, headers={"Accept-Encoding": "gzip"})
+    second = await http.get(URL, headers={"Accept-Encoding": "gzip"})
+    assert first.content == second.content
+    assert api.compression_stats.precompressed >= 1
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("*", negotiate("br, gzip")),
+    ("", None),
+])
+def test_negotiate(header, expected):
+    assert negotiate(header) == expected
@@ -0,0 +1,33 @@
+"""ContentStore snapshot identity across instances."""
+import pytest
+
+from content_store import ContentStore
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_digest_does_not_depend_on_how_the_snapshot_was_built(db, make_product):
+    await db.products.insert_many([make_product("alpha", order=1), make_product("gamma", order=3)])
+    live = ContentStore(db)
+    await live.load()
+
+    # Applied live, the new item lands after gamma; a fresh load sorts it between
+    await db.products.insert_one(make_product("beta", order=2))
+    # As a change stream delivers it: read back, with BSON-rounded dates
+    live.upsert("products", await db.products.find_one({"slug": "beta"}))
+    reloaded = ContentStore(db)
+    await reloaded.load()
+
+    assert [p.slug for p in reloaded.list("products")] == ["alpha", "beta", "gamma"]
+    assert live.digest("products") == reloaded.digest("products")
+
+
+async def test_digest_changes_with_content(db, make_product):
+    await db.products.insert_one(make_product("alpha"))
+    store = ContentStore(db)
+    await store.load()
+    before = store.digest("products")
+
+    doc = await db.products.find_one({"slug": "alpha"})
+    store.upsert("products", {**doc, "name": "Renamed"})
+    assert store.digest("products") != before
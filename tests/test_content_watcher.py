@@ -0,0 +1,260 @@
+"""ContentWatcher driven by a fake change-stream source, and its polling fallback."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from content_store import ContentStore, bump_content_version
+from content_watcher import MAX_OPEN_FAILURES, ContentWatcher
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeChangeStream:
+    """
+    Stands in for db.watch(): called with the resume token, used as an
+    async context manager, iterates over the queued events once.
+    """
+
+    def __init__(self, events=()):
+        self.events = list(events)
+        self.opened_with = []
+
+    def __call__(self, resume_token):
+        self.opened_with.append(resume_token)
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        events, self.events = self.events, []
+        for event in events:
+            yield event
+
+
+def change(operation, collection, doc=None, key=None, token=None):
+    event = {"_id": token, "operationType": operation, "ns": {"db": "relvanta_test", "coll": collection}}
+    if doc is not None or key is not None:
+        event["documentKey"] = {"_id": key if key is not None else doc["_id"]}
+    if operation in ("insert", "replace", "update"):
+        event["fullDocument"] = doc
+    return event
+
+
+@pytest.fixture
+async def store(db, make_product):
+    await db.products.insert_one(make_product("alpha"))
+    store = ContentStore(db)
+    await store.load()
+    return store
+
+
+async def stored(db, slug):
+    return await db.products.find_one({"slug": slug})
+
+
+async def wait_for(condition, timeout=1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+# ---------------------------------------------------------------------------
+# apply_change
+# ---------------------------------------------------------------------------
+
+
+async def test_insert_adds_the_document(db, make_product, store):
+    watcher = ContentWatcher(db, store)
+    await db.products.insert_one(make_product("beta"))
+    await watcher.apply_change(change("insert", "products", await stored(db, "beta")))
+    assert store.get("products", "beta").name == "Beta"
+
+
+async def test_update_replaces_the_document(db, store):
+    watcher = ContentWatcher(db, store)
+    doc = await stored(db, "alpha")
+    version = store.versions["products"]
+    await watcher.apply_change(change("update", "products", {**doc, "name": "Renamed"}))
+    assert store.get("products", "alpha").name == "Renamed"
+    assert store.versions["products"] > version
+
+
+async def test_update_without_full_document_removes_it(db, store):
+    # Deleted before the updateLookup ran
+    watcher = ContentWatcher(db, store)
+    doc = await stored(db, "alpha")
+    await watcher.apply_change(change("update", "products", key=doc["_id"]))
+    assert store.get("products", "alpha") is None
+
+
+async def test_delete_removes_the_document(db, store):
+    watcher = ContentWatcher(db, store)
+    doc = await stored(db, "alpha")
+    await watcher.apply_change(change("delete", "products", key=doc["_id"]))
+    assert store.get("products", "alpha") is None
+    assert store.list("products") == []
+
+
+async def test_unwatched_collections_are_ignored(db, store):
+    watcher = ContentWatcher(db, store)
+    version = store.version
+    await watcher.apply_change(change("insert", "users", {"_id": "u", "user_id": "u"}))
+    assert store.version == version
+
+
+async def test_content_meta_bump_reloads_the_snapshot(db, make_product, store):
+    watcher = ContentWatcher(db, store)
+    # Written without an event of its own, e.g. by seed_content.py
+    await db.products.insert_one(make_product("gamma"))
+    await bump_content_version(db)
+    await watcher.apply_change(change("update", "content_meta", {"_id": "content", "version": 1}))
+    assert store.get("products", "gamma") is not None
+    assert store.meta_version == 1
+
+
+async def test_invalidate_reloads_and_forgets_the_resume_token(db, make_product, store):
+    watcher = ContentWatcher(db, store)
+    watcher._resume_token = {"_data": "before"}
+    await db.products.insert_one(make_product("gamma"))
+    await watcher.apply_change(change("invalidate", None))
+    assert store.get("products", "gamma") is not None
+    assert watcher._resume_token is None
+
+
+# ---------------------------------------------------------------------------
+# _watch
+# ---------------------------------------------------------------------------
+
+
+async def test_watch_reloads_once_open_then_applies_events(db, make_product, store):
+    source = FakeChangeStream()
+    watcher = ContentWatcher(db, store, source=source)
+
+    # Written after the startup load but before the stream opened
+    await db.products.insert_one(make_product("early"))
+    beta = make_product("beta")
+    await db.products.insert_one(beta)
+    source.events = [
+        change("insert", "products", beta, token={"_data": "1"}),
+        change("update", "products", {**await stored(db, "alpha"), "name": "Renamed"}, token={"_data": "2"}),
+        change("delete", "products", key=beta["_id"], token={"_data": "3"}),
+    ]
+    await watcher._watch()
+
+    assert watcher.mode == "change_stream"
+    assert source.opened_with == [None]
+    assert store.get("products", "early") is not None
+    assert store.get("products", "alpha").name == "Renamed"
+    assert store.get("products", "beta") is None
+    assert watcher.events_applied == 3
+    assert watcher._resume_token == {"_data": "3"}
+
+
+async def test_watch_resumes_without_reloading(db, make_product, store):
+    source = FakeChangeStream([change("update", "products", await stored(db, "alpha"), token={"_data": "1"})])
+    watcher = ContentWatcher(db, store, source=source)
+    await watcher._watch()
+
+    # Not announced by an event, so a resumed stream must not pick it up
+    await db.products.insert_one(make_product("unseen"))
+    await watcher._watch()
+    assert source.opened_with == [None, {"_data": "1"}]
+    assert store.get("products", "unseen") is None
+
+
+async def test_run_falls_back_to_polling_without_change_streams(db, store):
+    def unsupported(resume_token):
+        raise NotImplementedError("standalone server")
+
+    watcher = ContentWatcher(db, store, poll_interval=3600, source=unsupported)
+    task = asyncio.create_task(watcher.run())
+    try:
+        assert await wait_for(lambda: watcher.mode == "polling")
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+async def test_run_polls_after_repeated_failures_to_open_the_stream(db, store):
+    attempts = []
+
+    def broken(resume_token):
+        # mongomock's db.watch fails like this
+        attempts.append(resume_token)
+        raise TypeError("watch() is not supported")
+
+    watcher = ContentWatcher(db, store, poll_interval=0, source=broken)
+    task = asyncio.create_task(watcher.run())
+    try:
+        assert await wait_for(lambda: watcher.mode == "polling")
+        assert len(attempts) == MAX_OPEN_FAILURES
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+class FailingMidStream(FakeChangeStream):
+    async def __aiter__(self):
+        raise TypeError("cursor died")
+        yield
+
+
+async def test_run_keeps_watching_after_errors_mid_stream(db, store):
+    source = FailingMidStream()
+    watcher = ContentWatcher(db, store, poll_interval=0, source=source)
+    task = asyncio.create_task(watcher.run())
+    try:
+        assert await wait_for(lambda: len(source.opened_with) > MAX_OPEN_FAILURES * 2)
+        assert watcher.mode == "change_stream"
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+# ---------------------------------------------------------------------------
+# poll_once
+# ---------------------------------------------------------------------------
+
+
+async def test_poll_picks_up_documents_changed_since_the_last_poll(db, make_product, store):
+    watcher = ContentWatcher(db, store)
+    watcher._reset_last_seen()
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=5)
+    await db.products.update_one({"slug": "alpha"}, {"$set": {"name": "Renamed", "updated_at": later}})
+    await db.products.insert_one(make_product("beta", updated_at=later))
+    await db.redirects.insert_one({"from": "/old", "to": "/new", "permanent": True})
+    await watcher.poll_once()
+
+    assert store.get("products", "alpha").name == "Renamed"
+    assert store.get("products", "beta") is not None
+    assert [r["from"] for r in store.redirects()] == ["/old"]
+
+
+async def test_poll_reloads_on_a_version_bump(db, store):
+    watcher = ContentWatcher(db, store)
+    watcher._reset_last_seen()
+
+    # Deletions leave no updated_at behind; the version bump covers them
+    await db.products.delete_one({"slug": "alpha"})
+    await bump_content_version(db)
+    await watcher.poll_once()
+    assert store.get("products", "alpha") is None
+
+
+async def test_poll_without_changes_leaves_the_store_alone(db, store):
+    watcher = ContentWatcher(db, store)
+    watcher._reset_last_seen()
+    version = store.version
+    await watcher.poll_once()
+    assert store.version == version
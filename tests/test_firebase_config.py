@@ -0,0 +1,124 @@
+"""VerifiedTokenMemo and verify_firebase_token, with the Admin SDK patched out."""
+import threading
+import time
+
+import pytest
+from firebase_admin import auth
+
+import firebase_config
+from firebase_config import VerifiedTokenMemo, verify_firebase_token
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(firebase_config.time, "time", clock)
+    return clock
+
+
+# ---------------------------------------------------------------------------
+# VerifiedTokenMemo
+# ---------------------------------------------------------------------------
+
+
+def test_memo_never_outlives_the_token_exp(clock):
+    memo = VerifiedTokenMemo(ttl_seconds=300)
+    memo.set("token", {"uid": "u", "exp": clock.now + 10})
+    clock.now += 9
+    assert memo.get("token") == {"uid": "u", "exp": clock.now + 1}
+    clock.now += 1
+    assert memo.get("token") is None
+
+
+def test_memo_expires_after_its_ttl_for_long_lived_tokens(clock):
+    memo = VerifiedTokenMemo(ttl_seconds=60)
+    memo.set("token", {"uid": "u", "exp": clock.now + 3600})
+    clock.now += 59
+    assert memo.get("token") is not None
+    clock.now += 1
+    assert memo.get("token") is None
+
+
+def test_memo_ignores_claims_without_exp(clock):
+    memo = VerifiedTokenMemo()
+    memo.set("token", {"uid": "u"})
+    assert memo.get("token") is None
+
+
+def test_memo_evicts_least_recently_set(clock):
+    memo = VerifiedTokenMemo(max_size=2)
+    for token in ("a", "b", "c"):
+        memo.set(token, {"uid": token, "exp": clock.now + 60})
+    assert memo.get("a") is None
+    assert memo.get("b") is not None and memo.get("c") is not None
+
+
+def test_memo_disabled_with_zero_size(clock):
+    memo = VerifiedTokenMemo(max_size=0)
+    memo.set("token", {"uid": "u", "exp": clock.now + 60})
+    assert memo.get("token") is None
+
+
+# ---------------------------------------------------------------------------
+# verify_firebase_token
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    """Patches auth.verify_id_token; records the thread of each call."""
+    calls = []
+    outcomes = {}
+
+    def verify_id_token(id_token):
+        calls.append((id_token, threading.current_thread()))
+        outcome = outcomes[id_token]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(firebase_config, "initialize_firebase", lambda: object())
+    monkeypatch.setattr(firebase_config, "verified_tokens", VerifiedTokenMemo())
+    monkeypatch.setattr(auth, "verify_id_token", verify_id_token)
+    verify_id_token.calls = calls
+    verify_id_token.outcomes = outcomes
+    return verify_id_token
+
+
+@pytest.mark.anyio
+async def test_valid_token_is_verified_once(verifier):
+    claims = {"uid": "u", "exp": time.time() + 600}
+    verifier.outcomes["good"] = claims
+    assert await verify_firebase_token("good") == claims
+    assert await verify_firebase_token("good") == claims
+    assert [token for token, _ in verifier.calls] == ["good"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("error", [
+    auth.InvalidIdTokenError("bad signature"),
+    auth.ExpiredIdTokenError("expired", cause=None),
+    RuntimeError("certificate fetch failed"),
+])
+async def test_failed_verification_is_not_memoized(verifier, error):
+    verifier.outcomes["bad"] = error
+    assert await verify_firebase_token("bad") is None
+    assert await verify_firebase_token("bad") is None
+    assert len(verifier.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_verification_runs_off_the_event_loop(verifier):
+    verifier.outcomes["good"] = {"uid": "u", "exp": time.time() + 600}
+    loop_thread = threading.current_thread()
+    await verify_firebase_token("good")
+    (_, verify_thread), = verifier.calls
+    assert verify_thread is not loop_thread
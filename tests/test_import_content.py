@@ -0,0 +1,145 @@
+"""Incremental import: hash diff, removal of dropped fields, version bumps."""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import import_content
+from import_content import HASH_FIELD, plan, stored_hashes, validate
+
+pytestmark = pytest.mark.anyio
+
+
+# Set by the import rather than written in import files
+NOT_IN_FILES = ("created_at", "updated_at", "status_rank", "order")
+
+
+@pytest.fixture
+def product(make_product):
+    """A products document as written in an import file; fields override."""
+
+    def make(slug, **fields):
+        doc = {k: v for k, v in make_product(slug).items() if k not in NOT_IN_FILES}
+        return {**doc, **fields}
+
+    return make
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(import_content, "AsyncIOMotorClient", lambda *args, **kwargs: client)
+    return client
+
+
+@pytest.fixture
+def db(client):
+    return client[os.environ["DB_NAME"]]
+
+
+@pytest.fixture
+def run(tmp_path, client):
+    """Import the given products from a JSON file, as the CLI would."""
+
+    async def run_import(products, **options):
+        path = tmp_path / "products.json"
+        path.write_text(json.dumps(products))
+        args = {
+            "paths": [path], "dry_run": False, "prune": False, "skip_invalid": False,
+            "batch_size": 500, "workers": 0, **options,
+        }
+        return await import_content.import_content(argparse.Namespace(**args))
+
+    return run_import
+
+
+async def content_version(db):
+    meta = await db.content_meta.find_one({"_id": "content"})
+    return meta["version"] if meta else None
+
+
+def validated(*docs):
+    valid, errors = validate({"products": [("products", "test", doc) for doc in docs]}, workers=0)
+    assert errors == []
+    return valid["products"]
+
+
+async def test_unchanged_reimport_writes_nothing(db, run, product):
+    products = [product("alpha", features=["x"]), product("beta")]
+    assert await run(products) == 0
+    assert await content_version(db) == 1
+    stored = await db.products.find_one({"slug": "alpha"})
+
+    existing = await stored_hashes(db, "products")
+    operations, counts = plan("products", validated(*products), existing, prune=False, now=datetime.now(timezone.utc))
+    assert operations == []
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 2, "deleted": 0}
+
+    assert await run(products) == 0
+    assert await content_version(db) == 1
+    assert await db.products.find_one({"slug": "alpha"}) == stored
+
+
+async def test_field_dropped_from_the_source_is_unset(db, run, product):
+    await run([product("alpha", features=["x"], order=3)])
+
+    existing = await stored_hashes(db, "products")
+    (operation,), counts = plan("products", validated(product("alpha")), existing, prune=False, now=datetime.now(timezone.utc))
+    assert counts["updated"] == 1
+    assert {"features", "order"} <= set(operation._doc["$unset"])
+    assert HASH_FIELD not in operation._doc["$unset"]
+
+    await run([product("alpha")])
+    stored = await db.products.find_one({"slug": "alpha"})
+    assert "features" not in stored and "order" not in stored
+    assert stored["created_at"] is not None
+    assert stored[HASH_FIELD] == import_content.content_hash(validated(product("alpha"))[0])
+
+
+async def test_created_at_survives_updates(db, run, product):
+    await run([product("alpha")])
+    created_at = (await db.products.find_one({"slug": "alpha"}))["created_at"]
+    await run([product("alpha", name="Renamed")])
+    stored = await db.products.find_one({"slug": "alpha"})
+    assert stored["name"] == "Renamed"
+    assert stored["created_at"] == created_at
+
+
+async def test_version_bumps_only_when_something_changed(db, run, product):
+    await run([product("alpha")])
+    assert await content_version(db) == 1
+
+    await run([product("alpha")])
+    assert await content_version(db) == 1
+
+    await run([product("alpha", tagline="new")])
+    assert await content_version(db) == 2
+
+    await run([product("alpha", tagline="new")])
+    assert await content_version(db) == 2
+
+
+async def test_dry_run_writes_nothing(db, run, product):
+    assert await run([product("alpha")], dry_run=True) == 0
+    assert await db.products.count_documents({}) == 0
+    assert await content_version(db) is None
+
+
+async def test_invalid_input_writes_nothing(db, run, product):
+    assert await run([product("alpha"), product("beta", status="unknown")]) == 1
+    assert await db.products.count_documents({}) == 0
+    assert await content_version(db) is None
+
+
+async def test_prune_deletes_documents_missing_from_the_input(db, run, product):
+    await run([product("alpha"), product("beta")])
+    await run([product("alpha")])
+    assert await db.products.count_documents({}) == 2
+    assert await content_version(db) == 1
+
+    await run([product("alpha")], prune=True)
+    assert [doc["slug"] async for doc in db.products.find({})] == ["alpha"]
+    assert await content_version(db) == 2
@@ -0,0 +1,40 @@
+"""Access to /metrics and what its labels reveal."""
+from types import SimpleNamespace
+
+import pytest
+
+from metrics import Metrics, MongoPoolMonitor
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_off_without_a_token(api, http, monkeypatch):
+    monkeypatch.setattr(api, "METRICS_TOKEN", None)
+    assert (await http.get("/metrics")).status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+async def test_metrics_reject_a_missing_or_wrong_token(api, http, monkeypatch, headers):
+    monkeypatch.setattr(api, "METRICS_TOKEN", "scrape-secret")
+    response = await http.get("/metrics", headers=headers)
+    assert response.status_code == 401
+    assert "http_requests_total" not in response.text
+
+
+async def test_metrics_with_the_token(api, http, monkeypatch):
+    monkeypatch.setattr(api, "METRICS_TOKEN", "scrape-secret")
+    response = await http.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "# TYPE http_requests_total counter" in response.text
+
+
+def test_pool_metrics_do_not_reveal_the_host():
+    metrics = Metrics()
+    monitor = MongoPoolMonitor(metrics)
+    event = SimpleNamespace(address=("db-internal.example.net", 27017))
+    monitor.connection_created(event)
+    monitor.connection_created(SimpleNamespace(address=("db-internal.example.net", 27017)))
+
+    rendered = metrics.render()
+    assert "db-internal" not in rendered
+    assert f'mongo_pool_connections{{server="{monitor._address(event)}"}} 2' in rendered
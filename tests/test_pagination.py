@@ -0,0 +1,94 @@
+"""Keyset pagination of content lists: cursors, ties, concurrent writes, ?fields=."""
+import base64
+import json
+
+import pytest
+
+from content_store import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+URL = "/api/content/products"
+
+
+async def all_pages(http, url, limit):
+    slugs, cursor, totals = [], None, set()
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = await http.get(url, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        slugs += [p["slug"] for p in body["products"]]
+        totals.add(body["total"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return slugs, totals
+
+
+@pytest.mark.parametrize("limit", [1, 4, 5, 12, 100])
+async def test_pages_are_unique_and_complete_across_ties(db, make_product, http, limit):
+    # Identical order, status and name: only the trailing id tells them apart
+    await db.products.insert_many([make_product(f"tied-{i:02d}", name="Same") for i in range(12)])
+    await db.products.insert_many([make_product(f"first-{i}", order=0) for i in range(3)])
+
+    slugs, totals = await all_pages(http, URL, limit)
+    assert len(slugs) == len(set(slugs)) == 15
+    assert slugs[:3] == ["first-0", "first-1", "first-2"]
+    assert totals == {15}
+
+
+async def test_cursor_survives_an_insert_between_pages(api, db, make_product, http):
+    await db.products.insert_many([make_product(f"item-{i}", order=i) for i in range(1, 7)])
+    first = (await http.get(URL, params={"limit": 3})).json()
+    assert [p["slug"] for p in first["products"]] == ["item-1", "item-2", "item-3"]
+
+    # One write sorting before the cursor, one after, applied as the watcher would
+    for doc in (make_product("early", order=0), make_product("late", order=4, name="Z")):
+        await db.products.insert_one(doc)
+        api.content_store.upsert("products", await db.products.find_one({"slug": doc["slug"]}))
+
+    rest = (await http.get(URL, params={"limit": 100, "cursor": first["next_cursor"]})).json()
+    assert [p["slug"] for p in rest["products"]] == ["item-4", "late", "item-5", "item-6"]
+    assert rest["total"] == 8
+    assert rest["next_cursor"] is None
+
+
+def b64(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    b64({"order": 1}),
+    b64([1, 0, "Name"]),                      # too short
+    b64([1, 0, "Name", "id", "extra"]),       # too long
+    b64(["1", 0, "Name", "id"]),              # wrong types
+    b64([True, 0, "Name", "id"]),             # bools are not ints
+    encode_cursor((1, "Name", "id")),         # a services cursor
+])
+async def test_malformed_or_tampered_cursor_is_a_400(db, make_product, http, cursor):
+    await db.products.insert_one(make_product("only"))
+    response = await http.get(URL, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_cursor_round_trip():
+    key = (2, 0, "Name, with ünicode", "id-1")
+    assert decode_cursor(encode_cursor(key), "products") == key
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(key), "services")
+
+
+async def test_unknown_field_is_a_400(db, make_product, http):
+    await db.products.insert_one(make_product("only"))
+    response = await http.get(URL, params={"fields": "name,no_such_field"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Unknown fields: no_such_field"}
+
+
+async def test_selected_fields_always_include_id_and_slug(db, make_product, http):
+    await db.products.insert_one(make_product("only"))
+    response = await http.get(URL, params={"fields": "name"})
+    assert response.status_code == 200
+    assert response.json()["products"] == [{"id": "id-only", "slug": "only", "name": "Only"}]
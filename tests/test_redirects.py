@@ -0,0 +1,111 @@
+"""
+RedirectMatcher, and the compiled form frontend-next/proxy.ts resolves
+against. Both must give the answers in CASES; resolve_compiled below
+follows proxy.ts's resolveRedirect line for line, so change them together.
+"""
+import pytest
+
+from redirects import RedirectMatcher, normalize_path
+
+RULES = [
+    {"from": "/old/page", "to": "/exact", "permanent": True},
+    {"from": "/old/*", "to": "/new/*", "permanent": False},
+    {"from": "/docs/*", "to": "/help", "permanent": True},
+    {"from": "/docs/api/*", "to": "/reference/*", "permanent": True},
+    {"from": "/legacy/*", "to": "/*", "permanent": True},
+    {"from": "/product/oneeye", "to": "/products/oneeye", "permanent": True},
+]
+
+# (request path, expected target or None, expected permanent)
+CASES = [
+    # Exact rules win over a wildcard covering the same path
+    ("/old/page", "/exact", True),
+    ("/old/other", "/new/other", False),
+    # Longest prefix wins
+    ("/docs/api/v1", "/reference/v1", True),
+    ("/docs/api", "/reference", True),
+    ("/docs/guide", "/help", True),
+    ("/docs", "/help", True),
+    # /* in the target receives the rest of the path
+    ("/old/a/b/c", "/new/a/b/c", False),
+    ("/old", "/new", False),
+    ("/legacy/x/y", "/x/y", True),
+    ("/legacy", "/", True),
+    # Trailing slashes are ignored
+    ("/old/page/", "/exact", True),
+    ("/product/oneeye/", "/products/oneeye", True),
+    ("/docs/api/", "/reference", True),
+    ("/old//", "/new", False),
+    # Prefixes match whole segments only
+    ("/olden", None, None),
+    ("/documents/x", None, None),
+    ("/", None, None),
+    ("/products/oneeye", None, None),
+]
+
+
+def resolve_compiled(compiled: dict, path: str):
+    """Python rendering of proxy.ts resolveRedirect over compiled()."""
+    pathname = path.rstrip("/") or "/"
+    exact = compiled["exact"].get(pathname)
+    if exact:
+        return {"to": exact[0], "permanent": exact[1]}
+
+    segments = [s for s in pathname.split("/") if s]
+    for depth in range(len(segments), -1, -1):
+        rule = compiled["prefix"].get("/" + "/".join(segments[:depth]))
+        if rule:
+            to = rule[0]
+            if to.endswith("/*"):
+                base = to[:-2].rstrip("/")
+                rest = "/".join(segments[depth:])
+                to = f"{base}/{rest}" if rest else (base or "/")
+            return {"to": to, "permanent": rule[1]}
+    return None
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return RedirectMatcher(RULES)
+
+
+@pytest.mark.parametrize("path, to, permanent", CASES)
+def test_resolve(matcher, path, to, permanent):
+    result = matcher.resolve(path)
+    if to is None:
+        assert result is None
+    else:
+        assert (result["to"], result["permanent"]) == (to, permanent)
+
+
+@pytest.mark.parametrize("path, to, permanent", CASES)
+def test_compiled_form_resolves_the_same(matcher, path, to, permanent):
+    result = resolve_compiled(matcher.compiled(), path)
+    assert result == (None if to is None else {"to": to, "permanent": permanent})
+
+
+def test_resolve_reports_the_matching_rule(matcher):
+    assert matcher.resolve("/docs/api/v1")["from"] == "/docs/api/*"
+    assert matcher.resolve("/old/page/")["from"] == "/old/page"
+
+
+def test_root_wildcard_matches_everything():
+    matcher = RedirectMatcher([{"from": "/*", "to": "https://example.com/*", "permanent": False}])
+    assert matcher.resolve("/a/b")["to"] == "https://example.com/a/b"
+    assert resolve_compiled(matcher.compiled(), "/a/b")["to"] == "https://example.com/a/b"
+
+
+@pytest.mark.parametrize("raw, normalized", [
+    ("/a/b/", "/a/b"),
+    ("a/b", "/a/b"),
+    ("  /a ", "/a"),
+    ("/", "/"),
+    ("", "/"),
+])
+def test_normalize_path(raw, normalized):
+    assert normalize_path(raw) == normalized
+
+
+def test_incomplete_rules_are_skipped():
+    matcher = RedirectMatcher([{"from": "/a"}, {"to": "/b"}, {"from": "/c", "to": "/d"}])
+    assert matcher.compiled() == {"exact": {"/c": ["/d", True]}, "prefix": {}}
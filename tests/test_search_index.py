@@ -0,0 +1,90 @@
+"""SearchIndex: BM25 ranking, prefix matching and incremental re-indexing."""
+import pytest
+
+from content_store import ContentStore
+from search_index import SearchIndex
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def store(db, make_product):
+    await db.products.insert_many([
+        make_product("in-name", name="Analytics Suite", long_description="tools for teams"),
+        make_product("in-body", name="Dashboard", long_description="built-in analytics reports"),
+        make_product("prefix-only", name="Analysis Kit", long_description="for teams"),
+        make_product("unrelated", name="Scheduler", long_description="calendar sync"),
+        make_product("exact", name="Planner", long_description="built-in planner report"),
+    ])
+    store = ContentStore(db)
+    await store.load()
+    return store
+
+
+@pytest.fixture
+async def index(store):
+    index = SearchIndex(store)
+    index.sync()
+    return index
+
+
+def slugs(hits):
+    return [item.slug for _, _, item in hits]
+
+
+async def test_field_weights_rank_name_matches_first(index):
+    hits, total = index.search("analytics", ["products"])
+    assert slugs(hits)[:2] == ["in-name", "in-body"]
+    assert hits[0][0] > hits[1][0]
+
+
+async def test_prefix_matches_every_expansion(index):
+    hits, total = index.search("analy", ["products"])
+    assert set(slugs(hits)) == {"in-name", "in-body", "prefix-only"}
+    assert total == 3
+    assert "prefix-only" not in slugs(index.search("analytics", ["products"])[0])
+
+
+async def test_prefix_matches_rank_below_exact_ones(index):
+    # "report" is exact for one, a prefix of "reports" for the other; fields and lengths match
+    hits, _ = index.search("report", ["products"])
+    assert slugs(hits) == ["exact", "in-body"]
+    assert hits[1][0] < hits[0][0]
+
+
+async def test_every_term_must_match(index):
+    hits, total = index.search("analytics teams", ["products"])
+    assert slugs(hits) == ["in-name"]
+    assert total == 1
+    assert index.search("analytics calendar", ["products"]) == ([], 0)
+
+
+async def test_limit_and_allow_filter(index):
+    hits, total = index.search("analy", ["products"], limit=1)
+    assert len(hits) == 1 and total == 3
+
+    hits, total = index.search("analy", ["products"], allow=lambda c, item: item.slug != "in-name")
+    assert set(slugs(hits)) == {"in-body", "prefix-only"}
+    assert total == 2
+
+
+async def test_other_collections_are_excluded(index):
+    assert index.search("analytics", ["services", "pages"]) == ([], 0)
+
+
+async def test_empty_query(index):
+    assert index.search("  !! ", ["products"]) == ([], 0)
+
+
+async def test_sync_reindexes_only_changed_documents(db, store, index):
+    assert index.sync() == 0
+
+    doc = await db.products.find_one({"slug": "unrelated"})
+    store.upsert("products", {**doc, "name": "Analytics Scheduler"})
+    assert index.sync() == 1
+    assert "unrelated" in slugs(index.search("analytics", ["products"])[0])
+
+    store.remove("products", doc["_id"])
+    assert index.sync() == 1
+    assert index.search("scheduler", ["products"]) == ([], 0)
+    assert index.stats()["documents"] == 4